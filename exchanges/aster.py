@@ -265,6 +265,10 @@ class AsterWebSocketManager:
             executed_qty = order_info.get('z', '0')
             status = order_info.get('X', '')
 
+            # User data stream covers every symbol; only forward our contract
+            if symbol != self.config.contract_id:
+                return
+
             # Map status
             status_map = {
                 'NEW': 'OPEN',
@@ -340,6 +344,8 @@ class AsterClient(BaseExchangeClient):
         # Initialize logger early
         self.logger = TradingLogger(exchange="aster", ticker=self.config.ticker, log_to_console=False)
         self._order_update_handler = None
+        # Long-lived REST session so polling requests reuse keep-alive connections
+        self._session: Optional[aiohttp.ClientSession] = None
 
     def _validate_config(self) -> None:
         """Validate Aster configuration."""
@@ -362,6 +368,14 @@ class AsterClient(BaseExchangeClient):
 
         return signature
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared REST session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+            )
+        return self._session
+
     async def _make_request(
         self, method: str, endpoint: str, params: Dict[str, Any] = None, data: Dict[str, Any] = None
     ) -> Dict[str, Any]:
@@ -382,39 +396,39 @@ class AsterClient(BaseExchangeClient):
             'Content-Type': 'application/x-www-form-urlencoded'
         }
 
-        async with aiohttp.ClientSession() as session:
-            if method.upper() == 'GET':
-                # For GET requests, signature is based on query parameters only
-                signature = self._generate_signature(params)
-                params['signature'] = signature
+        session = self._get_session()
+        if method.upper() == 'GET':
+            # For GET requests, signature is based on query parameters only
+            signature = self._generate_signature(params)
+            params['signature'] = signature
 
-                async with session.get(url, params=params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
-            elif method.upper() == 'POST':
-                # For POST requests, signature must include both query string and request body
-                # According to Aster API docs: totalParams = queryString + requestBody
-                all_params = {**params, **data}
-                signature = self._generate_signature(all_params)
-                all_params['signature'] = signature
-
-                async with session.post(url, data=all_params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
-            elif method.upper() == 'DELETE':
-                # For DELETE requests, signature is based on query parameters only
-                signature = self._generate_signature(params)
-                params['signature'] = signature
-
-                async with session.delete(url, params=params, headers=headers) as response:
-                    result = await response.json()
-                    if response.status != 200:
-                        raise Exception(f"API request failed: {result}")
-                    return result
+            async with session.get(url, params=params, headers=headers) as response:
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
+        elif method.upper() == 'POST':
+            # For POST requests, signature must include both query string and request body
+            # According to Aster API docs: totalParams = queryString + requestBody
+            all_params = {**params, **data}
+            signature = self._generate_signature(all_params)
+            all_params['signature'] = signature
+
+            async with session.post(url, data=all_params, headers=headers) as response:
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
+        elif method.upper() == 'DELETE':
+            # For DELETE requests, signature is based on query parameters only
+            signature = self._generate_signature(params)
+            params['signature'] = signature
+
+            async with session.delete(url, params=params, headers=headers) as response:
+                result = await response.json()
+                if response.status != 200:
+                    raise Exception(f"API request failed: {result}")
+                return result
 
     async def connect(self) -> None:
         """Connect to Aster WebSocket."""
@@ -443,6 +457,8 @@ class AsterClient(BaseExchangeClient):
         try:
             if hasattr(self, 'ws_manager') and self.ws_manager:
                 await self.ws_manager.disconnect()
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
         except Exception as e:
             self.logger.log(f"Error during Aster disconnect: {e}", "ERROR")
 
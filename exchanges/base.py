@@ -120,7 +120,19 @@ class BaseExchangeClient(ABC):
 
     @abstractmethod
     def setup_order_update_handler(self, handler) -> None:
-        """Setup order update handler for WebSocket."""
+        """Setup order update handler for WebSocket.
+
+        Implementations only invoke handler for updates on config.contract_id.
+        """
+        pass
+
+    def setup_bbo_update_handler(self, handler) -> None:
+        """Setup best bid/ask update handler for WebSocket.
+
+        Optional: clients with a market-data stream (EdgeX) call handler(best_bid, best_ask)
+        on the event loop for every top-of-book change; the default is a no-op and callers
+        fall back to fetch_bbo_prices.
+        """
         pass
 
     @abstractmethod
@@ -49,6 +49,12 @@ class EdgeXClient(BaseExchangeClient):
 
         self._order_update_handler = None
 
+        # --- public depth stream (started only when a BBO handler is registered) ---
+        self._bbo_handler = None
+        self._depth_book = {'bids': {}, 'asks': {}}  # price -> size, maintained from depth pushes
+        self._public_ws_task: Optional[asyncio.Task] = None
+        self._public_ws_disconnected = asyncio.Event()
+
         # --- reconnection state ---
         self._ws_task: Optional[asyncio.Task] = None
         self._ws_stop = asyncio.Event()
@@ -85,38 +91,66 @@ class EdgeXClient(BaseExchangeClient):
         if not self._ws_task or self._ws_task.done():
             self._ws_task = asyncio.create_task(self._run_private_ws())
 
+        if self._bbo_handler:
+            try:
+                public_client = self.ws_manager.get_public_client()
+                public_client.on_disconnect(
+                    lambda exc: self._loop.call_soon_threadsafe(self._public_ws_disconnected.set)
+                )
+                public_client.on_message("depth", self._handle_depth_message)
+            except Exception as e:
+                self.logger.log(f"[WS public] failed to set hooks: {e}", "ERROR")
+
+            if not self._public_ws_task or self._public_ws_task.done():
+                self._public_ws_task = asyncio.create_task(self._run_public_ws())
+
         # give first connection a moment (optional)
         await asyncio.sleep(0.5)
 
     async def _run_private_ws(self):
+        """Keep the private (order update) WS connected."""
+        await self._run_ws("[WS]", self.ws_manager.connect_private, self.ws_manager.disconnect_private,
+                           self._ws_disconnected)
+
+    async def _run_public_ws(self):
+        """Keep the public depth WS connected and subscribed to our contract."""
+        def connect_public():
+            self._depth_book = {'bids': {}, 'asks': {}}
+            self.ws_manager.connect_public()
+            self.ws_manager.get_public_client().subscribe(f"depth.{self.config.contract_id}.15")
+
+        await self._run_ws("[WS public]", connect_public, self.ws_manager.disconnect_public,
+                           self._public_ws_disconnected)
+
+    async def _run_ws(self, label, connect, disconnect, disconnected: asyncio.Event):
         """Tiny reconnect loop with exponential backoff."""
         backoff = 1.0
         while not self._ws_stop.is_set():
             try:
                 # connect
-                self.ws_manager.connect_private()
-                self.logger.log("[WS] connected", "INFO")
+                connect()
+                self.logger.log(f"{label} connected", "INFO")
                 backoff = 1.0
 
                 # wait until either disconnect or stop
-                self._ws_disconnected.clear()
+                disconnected.clear()
                 done, _ = await asyncio.wait(
                     {asyncio.create_task(self._ws_stop.wait()),
-                    asyncio.create_task(self._ws_disconnected.wait()),},
+                    asyncio.create_task(disconnected.wait()),},
                     return_when=asyncio.FIRST_COMPLETED,
                 )
                 if self._ws_stop.is_set():
                     break
 
                 self.logger.log(
-                    "[WS] disconnected; attempting to reconnect…", "WARNING"
+                    f"{label} disconnected; attempting to reconnect…", "WARNING"
                 )
             except Exception as e:
-                self.logger.log(f"[WS] connect error: {e}", "ERROR")
+                self.logger.log(f"{label} connect error: {e}", "ERROR")
             finally:
                 # ensure socket is closed before retry
                 try:
-                    self.ws_manager.disconnect_private()
+                    disconnect()
                 except Exception:
                     pass
 
@@ -126,7 +160,7 @@ class EdgeXClient(BaseExchangeClient):
 
         # Final cleanup (on stop)
         try:
-            self.ws_manager.disconnect_private()
+            disconnect()
         except Exception:
             pass
 
@@ -136,6 +170,8 @@ class EdgeXClient(BaseExchangeClient):
             self._ws_stop.set()
             if self._ws_task:
                 await self._ws_task
+            if self._public_ws_task:
+                await self._public_ws_task
         except Exception:
             pass
 
@@ -228,6 +264,43 @@ class EdgeXClient(BaseExchangeClient):
         except Exception as e:
             self.logger.log(f"Could not add trade-event handler: {e}", "ERROR")
 
+    def setup_bbo_update_handler(self, handler) -> None:
+        """Push best bid/ask from the public depth stream to handler (called on the event loop)."""
+        self._bbo_handler = handler
+
+    def _handle_depth_message(self, message):
+        """Apply a depth snapshot/delta for our contract and forward the new best bid/ask.
+
+        Runs on the SDK's WebSocket thread; the handler is scheduled onto the event loop.
+        """
+        try:
+            if isinstance(message, str):
+                message = json.loads(message)
+
+            content = message.get("content", {})
+            for entry in content.get("data", []):
+                if str(entry.get("contractId", self.config.contract_id)) != str(self.config.contract_id):
+                    continue
+
+                # SNAPSHOT replaces the book, CHANGED carries per-level updates (size 0 removes the level)
+                if str(entry.get("depthType", content.get("dataType", ""))).upper() == "SNAPSHOT":
+                    self._depth_book = {'bids': {}, 'asks': {}}
+                for side in ('bids', 'asks'):
+                    levels = self._depth_book[side]
+                    for level in entry.get(side, []):
+                        price, size = Decimal(level['price']), Decimal(level['size'])
+                        if size == 0:
+                            levels.pop(price, None)
+                        else:
+                            levels[price] = size
+
+            bids, asks = self._depth_book['bids'], self._depth_book['asks']
+            if bids and asks and self._bbo_handler and self._loop:
+                self._loop.call_soon_threadsafe(self._bbo_handler, max(bids), min(asks))
+
+        except Exception as e:
+            self.logger.log(f"Error handling depth update: {e}", "ERROR")
+
     # ---------------------------
     # REST-ish helpers
     # ---------------------------
@@ -470,10 +470,11 @@ class ExtendedClient(BaseExchangeClient):
         }
 
         attempt = 0
-        while not order_info and attempt < 50:
-            attempt += 1
-            try:
-                async with aiohttp.ClientSession() as session:
+        # One session for all retries so attempts reuse the same keep-alive connection
+        async with aiohttp.ClientSession() as session:
+            while not order_info and attempt < 50:
+                attempt += 1
+                try:
                     async with session.get(url, headers=headers) as response:
                         if response.status == 200:
                             data = await response.json()
@@ -510,10 +511,10 @@ class ExtendedClient(BaseExchangeClient):
                         else:
                             self.logger.log(f"Failed to get order info attempt {attempt} for {order_id}: HTTP {response.status}", "ERROR")
                             
-            except Exception as e:
-                self.logger.log(f"Error getting order info attempt {attempt} for {order_id}: {str(e)}", "ERROR")
-            
-            await asyncio.sleep(0.5)
+                except Exception as e:
+                    self.logger.log(f"Error getting order info attempt {attempt} for {order_id}: {str(e)}", "ERROR")
+
+                await asyncio.sleep(0.5)
         return order_info
 
     async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
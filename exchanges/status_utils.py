@@ -5,9 +5,36 @@
 设计：不改变原有状态映射，在使用处提供兼容判断。
 """
 
+from enum import IntEnum
 from typing import Optional
 
 
+class StatusClass(IntEnum):
+    """统一的订单状态分类"""
+    FILLED = 1
+    CANCELED = 2
+    OPEN = 3
+    PARTIAL = 4
+    UNKNOWN = 5
+
+
+_STATUS_TABLE = {
+    'FILLED': StatusClass.FILLED,
+    'CANCELED': StatusClass.CANCELED,
+    'CANCELLED': StatusClass.CANCELED,
+    'REJECTED': StatusClass.CANCELED,
+    'OPEN': StatusClass.OPEN,
+    'NEW': StatusClass.OPEN,
+    'PENDING': StatusClass.OPEN,
+    'CANCELING': StatusClass.OPEN,
+    'PARTIALLY_FILLED': StatusClass.PARTIAL,
+}
+
+_FILLED = frozenset({'FILLED'})
+_CANCELED = frozenset({'CANCELED', 'CANCELLED', 'REJECTED'})
+_OPEN = frozenset({'OPEN', 'NEW', 'PENDING'})
+
+
 def is_order_filled(status: str, cancel_reason: Optional[str] = None) -> bool:
     """
     判断订单是否完全成交
@@ -23,12 +50,8 @@ def is_order_filled(status: str, cancel_reason: Optional[str] = None) -> bool:
     Returns:
         bool: 是否完全成交
     """
-    if status == 'FILLED':
-        return True
     # Paradex: CLOSED without cancel_reason means FILLED
-    if status == 'CLOSED' and not cancel_reason:
-        return True
-    return False
+    return status in _FILLED or (status == 'CLOSED' and not cancel_reason)
 
 
 def is_order_canceled(status: str, cancel_reason: Optional[str] = None) -> bool:
@@ -48,13 +71,8 @@ def is_order_canceled(status: str, cancel_reason: Optional[str] = None) -> bool:
     Returns:
         bool: 是否被取消/拒绝
     """
-    # 标准取消状态
-    if status in ['CANCELED', 'CANCELLED', 'REJECTED']:
-        return True
-    # Paradex: CLOSED with cancel_reason means CANCELED
-    if status == 'CLOSED' and cancel_reason:
-        return True
-    return False
+    # 标准取消状态; Paradex: CLOSED with cancel_reason means CANCELED
+    return status in _CANCELED or (status == 'CLOSED' and bool(cancel_reason))
 
 
 def is_order_open(status: str) -> bool:
@@ -72,7 +90,7 @@ def is_order_open(status: str) -> bool:
     Returns:
         bool: 是否打开
     """
-    return status in ['OPEN', 'NEW', 'PENDING']
+    return status in _OPEN
 
 
 def is_order_partially_filled(status: str, filled_size: float = 0) -> bool:
@@ -86,12 +104,8 @@ def is_order_partially_filled(status: str, filled_size: float = 0) -> bool:
     Returns:
         bool: 是否部分成交
     """
-    if status == 'PARTIALLY_FILLED':
-        return True
     # OPEN with filled_size > 0 means partially filled
-    if status == 'OPEN' and filled_size > 0:
-        return True
-    return False
+    return status == 'PARTIALLY_FILLED' or (status == 'OPEN' and filled_size > 0)
 
 
 def should_retry_post_only(status: str, cancel_reason: Optional[str] = None) -> bool:
@@ -107,9 +121,27 @@ def should_retry_post_only(status: str, cancel_reason: Optional[str] = None) ->
     Returns:
         bool: 是否应该重试
     """
-    if cancel_reason == 'POST_ONLY_WOULD_CROSS':
-        return True
     # GRVT: REJECTED通常意味着价格问题，应该重试
-    if status == 'REJECTED':
-        return True
-    return False
+    return cancel_reason == 'POST_ONLY_WOULD_CROSS' or status == 'REJECTED'
+
+
+def classify_order_status(status: str, cancel_reason: Optional[str] = None,
+                          filled_size: float = 0) -> StatusClass:
+    """
+    一次查表完成订单状态分类，替代依次调用多个判断函数
+
+    Args:
+        status: 订单状态
+        cancel_reason: 取消原因（可选）
+        filled_size: 已成交数量
+
+    Returns:
+        StatusClass: 状态分类
+    """
+    # Paradex: CLOSED 需要 cancel_reason 区分成交/取消
+    if status == 'CLOSED':
+        return StatusClass.CANCELED if cancel_reason else StatusClass.FILLED
+    status_class = _STATUS_TABLE.get(status, StatusClass.UNKNOWN)
+    if status_class is StatusClass.OPEN and filled_size > 0:
+        return StatusClass.PARTIAL
+    return status_class
@@ -1,5 +1,3 @@
-import pytz
-from datetime import datetime
 from abc import ABC, abstractmethod
 import asyncio
 import signal
@@ -11,16 +9,58 @@ import argparse
 import traceback
 import csv
 from decimal import Decimal
-from typing import Tuple
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import sys
 import os
 
+from exchanges.status_utils import StatusClass, classify_order_status
 from hedge.lighter_proxy import LighterProxy
-from helpers.logger import log_trade_to_csv
+from helpers.logger import log_trade_to_csv, trade_csv_row, write_trade_rows
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+@lru_cache(maxsize=4096)
+def _to_dec(value) -> Decimal:
+    """Convert WS string fields to Decimal, caching repeated prices/sizes."""
+    return Decimal(value)
+
+
+_ONE = Decimal(1)
+# Max tolerated |primary + lighter| position imbalance before the loop stops
+_MAX_POSITION_DIFF = Decimal('0.2')
+# Primary side -> opposite Lighter hedge side / order type label
+_FLIP = {'buy': 'sell', 'sell': 'buy'}
+_ORDER_TYPE = {'buy': 'OPEN', 'sell': 'CLOSE'}
+# Status classes for which a resting post-only order is still live
+_ACTIVE_STATUS = frozenset({StatusClass.OPEN, StatusClass.PARTIAL})
+# Oldest WebSocket-pushed BBO (seconds) the reprice check trusts before falling back to REST
+_PUSHED_BBO_MAX_AGE = 2.0
+
+_FILE_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_CONSOLE_FORMATTER = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
+_external_loggers_silenced = False
+
+
+def _silence_external_loggers():
+    """Disable verbose logging from external libraries, once per process."""
+    global _external_loggers_silenced
+    if _external_loggers_silenced:
+        return
+    logging.getLogger('urllib3').setLevel(logging.CRITICAL)
+    logging.getLogger('requests').setLevel(logging.CRITICAL)
+    logging.getLogger('websockets').setLevel(logging.CRITICAL)
+    logging.getLogger('pysdk').setLevel(logging.CRITICAL)
+    # todo: primary log level
+    logging.getLogger('lighter').setLevel(logging.CRITICAL)
+    logging.getLogger('lighter.signer_client').setLevel(logging.CRITICAL)
+
+    # Disable root logger propagation to prevent external logs
+    logging.getLogger().setLevel(logging.CRITICAL)
+    _external_loggers_silenced = True
+
+
 class Config:
     """Simple config class to wrap dictionary for primary client."""
 
@@ -32,6 +72,8 @@ class HedgeBotAbc(ABC):
     """Trading bot that places post-only orders on primary and hedges with market orders on Lighter."""
 
     def __init__(self, ticker: str, order_quantity: Decimal, fill_timeout: int = 5, iterations: int = 20):
+        # Constant per subclass; cached to keep the method call off the WS hot path
+        self._exchange_name = self.primary_exchange_name()
         self.ticker = ticker
         self.order_quantity = order_quantity
         self.fill_timeout = fill_timeout
@@ -45,6 +87,18 @@ class HedgeBotAbc(ABC):
         self.primary_contract_id = None
         self.primary_tick_size = None
         self.primary_order_status = None
+        # Set on every primary status change so the post-only loop wakes without polling
+        self._status_event = asyncio.Event()
+        # Set once a primary fill is ready to be hedged on Lighter
+        self._lighter_ready = asyncio.Event()
+        self._loop = None
+        # Latest primary BBO pushed over WebSocket, None until the first update
+        self._best_bid = None
+        self._best_ask = None
+        self._bbo_time = None  # monotonic time of the last BBO push
+        # Trade CSV rows drained in batches by a background task once run() starts
+        self._csv_queue = asyncio.Queue()
+        self._csv_task = None
 
         # Initialize CSV file with headers if it doesn't exist
         self._initialize_log_file()
@@ -83,54 +137,36 @@ class HedgeBotAbc(ABC):
     def _initialize_log_file(self):
         # Initialize logging to file
         os.makedirs("logs", exist_ok=True)
-        self.log_filename = f"logs/{self.primary_exchange_name()}_{self.ticker}_hedge_mode_log.txt"
+        self.log_filename = f"logs/{self._exchange_name}_{self.ticker}_hedge_mode_log.txt"
         self.original_stdout = sys.stdout
 
     def _initialize_logger(self):
-        # Setup logger
-        self.logger = logging.getLogger(f"hedge_bot_{self.ticker}")
+        # Setup logger, named like the log file so bots on different exchanges never share handlers
+        self.logger = logging.getLogger(f"hedge_bot_{self._exchange_name}_{self.ticker}")
         self.logger.setLevel(logging.INFO)
+        # Prevent propagation to root logger to avoid duplicate messages and external logs
+        self.logger.propagate = False
 
-        # Clear any existing handlers to avoid duplicates
-        self.logger.handlers.clear()
-
-        # Disable verbose logging from external libraries
-        logging.getLogger('urllib3').setLevel(logging.CRITICAL)
-        logging.getLogger('requests').setLevel(logging.CRITICAL)
-        logging.getLogger('websockets').setLevel(logging.CRITICAL)
-        logging.getLogger('pysdk').setLevel(logging.CRITICAL)
-        # todo: primary log level
-        logging.getLogger('lighter').setLevel(logging.CRITICAL)
-        logging.getLogger('lighter.signer_client').setLevel(logging.CRITICAL)
+        _silence_external_loggers()
 
-        # Disable root logger propagation to prevent external logs
-        logging.getLogger().setLevel(logging.CRITICAL)
+        # Reuse handlers when another bot already configured this logger name
+        if self.logger.handlers:
+            return
 
-        # Create file handler
-        file_handler = logging.FileHandler(self.log_filename)
+        # Create file handler, opened lazily on the first record
+        file_handler = logging.FileHandler(self.log_filename, delay=True)
         file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(_FILE_FORMATTER)
 
         # Create console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-
-        # Create different formatters for file and console
-        file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_formatter = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
-
-        file_handler.setFormatter(file_formatter)
-        console_handler.setFormatter(console_formatter)
+        console_handler.setFormatter(_CONSOLE_FORMATTER)
 
         # Add handlers to logger
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
 
-        # Prevent propagation to root logger to avoid duplicate messages and external logs
-        self.logger.propagate = False
-
-        # Ensure our logger only shows our messages
-        self.logger.setLevel(logging.INFO)
-
     def _initialize_primary_client(self):
         for key, value in self.primary_client_vars().items():
             setattr(self, key, value)
@@ -139,7 +175,7 @@ class HedgeBotAbc(ABC):
     async def _init_primary_contract_info(self) -> Tuple[str, Decimal]:
         """Get Primary contract ID and tick size."""
         if not self.primary_client:
-            raise Exception(f"{self.primary_exchange_name()} client not initialized")
+            raise Exception(f"{self._exchange_name} client not initialized")
 
         contract_id, tick_size = await self.primary_client.get_contract_attributes()
 
@@ -153,103 +189,149 @@ class HedgeBotAbc(ABC):
     async def _setup_primary_websocket(self):
         """Setup Primary websocket for order updates and order book data."""
         if not self.primary_client:
-            raise Exception(f"{self.primary_exchange_name()} client not initialized")
+            raise Exception(f"{self._exchange_name} client not initialized")
+
+        self._loop = asyncio.get_running_loop()
 
         def order_update_handler(order_data):
             """Handle order updates from Primary WebSocket."""
-            if order_data.get('contract_id') != self.primary_contract_id:
+            get = order_data.get
+            if get('contract_id') != self.primary_contract_id:
                 return
+            log = self.logger.info
+            exchange = self._exchange_name
             try:
-                order_id = order_data.get('order_id')
-                status = order_data.get('status')
-                side = order_data.get('side', '').lower()
-                filled_size = Decimal(order_data.get('filled_size', '0'))
-                size = Decimal(order_data.get('size', '0'))
-                price = order_data.get('price', '0')
-
-                if side == 'buy':
-                    order_type = "OPEN"
-                else:
-                    order_type = "CLOSE"
-
-                if status == 'CANCELED' and filled_size > 0:
+                order_id = get('order_id')
+                status = get('status')
+                side = get('side', '').lower()
+                filled_size = _to_dec(get('filled_size') or '0')
+                size = _to_dec(get('size') or '0')
+                price = get('price', '0')
+
+                order_type = _ORDER_TYPE.get(side, "CLOSE")
+
+                status_class = classify_order_status(status, get('cancel_reason'), filled_size)
+                if status_class is StatusClass.CANCELED and filled_size > 0:
+                    status_class = StatusClass.FILLED
+                if status_class is StatusClass.FILLED:
                     status = 'FILLED'
+                elif status_class is StatusClass.CANCELED and status != 'REJECTED':
+                    # CANCELLED / CLOSED with a cancel_reason: a genuine cancel the post-only loop re-places;
+                    # REJECTED stays raw so the loop stops instead of retrying forever
+                    status = 'CANCELED'
 
                 # Handle the order update
-                if status == 'FILLED' and self.primary_order_status != 'FILLED':
+                if status_class is StatusClass.FILLED and self.primary_order_status != 'FILLED':
                     if side == 'buy':
                         self.primary_position += filled_size
                     else:
                         self.primary_position -= filled_size
-                    self.logger.info(f"[{order_id}] [{order_type}] [{self.primary_exchange_name()}] [{status}]: {filled_size} @ {price}")
+                    log("[%s] [%s] [%s] [%s]: %s @ %s", order_id, order_type, exchange, status, filled_size, price)
                     self.primary_order_status = status
 
                     # Log Primary trade to CSV
-                    log_trade_to_csv(
-                        exchange=self.primary_exchange_name(),
-                        ticker=self.ticker,
-                        side=side,
-                        price=str(price),
-                        quantity=str(filled_size)
-                    )
-                    self.logger.info(
-                        f"📊 Trade logged to CSV: {self.primary_exchange_name()} {side} {str(filled_size)} @ {price}")
-
-                    self.handle_primary_order_update({
-                        'order_id': order_id,
-                        'side': side,
-                        'status': status,
-                        'size': size,
-                        'price': price,
-                        'contract_id': self.primary_contract_id,
-                        'filled_size': filled_size
-                    })
+                    self._log_trade(side, str(price), str(filled_size))
+                    if self.logger.isEnabledFor(logging.INFO):
+                        log("📊 Trade logged to CSV: %s %s %s @ %s", exchange, side, filled_size, price)
+
+                    self.handle_primary_order_update(side, filled_size, _to_dec(price or '0'))
+                    self._notify_status_change()
                 elif self.primary_order_status != 'FILLED':
-                    if status == 'OPEN':
-                        self.logger.info(f"[{order_id}] [{order_type}] [{self.primary_exchange_name()}] [{status}]: {size} @ {price}")
+                    if status_class is StatusClass.OPEN:
+                        log("[%s] [%s] [%s] [%s]: %s @ %s", order_id, order_type, exchange, status, size, price)
                     else:
-                        self.logger.info(f"[{order_id}] [{order_type}] [{self.primary_exchange_name()}] [{status}]: {filled_size} @ {price}")
+                        log("[%s] [%s] [%s] [%s]: %s @ %s", order_id, order_type, exchange, status, filled_size, price)
                     self.primary_order_status = status
+                    self._notify_status_change()
 
             except Exception as e:
-                self.logger.error(f"Error handling {self.primary_exchange_name()} order update: {e}")
+                self.logger.error(f"Error handling {exchange} order update: {e}")
+
+        def bbo_update_handler(best_bid, best_ask):
+            """Cache best bid/ask pushed from Primary WebSocket."""
+            self._best_bid, self._best_ask = _to_dec(best_bid), _to_dec(best_ask)
+            self._bbo_time = time.monotonic()
 
         try:
             # Setup order update handler
             self.primary_client.setup_order_update_handler(order_update_handler)
-            self.logger.info(f"✅ {self.primary_exchange_name()} WebSocket order update handler set up")
+            self.primary_client.setup_bbo_update_handler(bbo_update_handler)
+            self.logger.info("✅ %s WebSocket order update handler set up", self._exchange_name)
 
             # Connect to Primary WebSocket
             await self.primary_client.connect()
-            self.logger.info(f"✅ {self.primary_exchange_name()} WebSocket connection established")
+            self.logger.info("✅ %s WebSocket connection established", self._exchange_name)
 
         except Exception as e:
-            self.logger.error(f"Could not setup {self.primary_exchange_name()} WebSocket handlers: {e}")
+            self.logger.error(f"Could not setup {self._exchange_name} WebSocket handlers: {e}")
             sys.exit(1)
 
     def _update_lighter_position(self, position_change: Decimal):
         """Handle Lighter position change callback."""
         self.lighter_position += position_change
-        self.logger.info(f"📊 Lighter position updated: {position_change:+} → {self.lighter_position}")
+        self.logger.info("📊 Lighter position updated: %s → %s", format(position_change, '+'), self.lighter_position)
+
+    def _log_trade(self, side: str, price: str, quantity: str):
+        """Queue a trade row for the CSV writer task, or write it directly if the task isn't running."""
+        if self._csv_task is None:
+            log_trade_to_csv(
+                exchange=self._exchange_name,
+                ticker=self.ticker,
+                side=side,
+                price=price,
+                quantity=quantity
+            )
+            return
+        row = trade_csv_row(self._exchange_name, side, price, quantity)
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            # Enqueue immediately so a _flush_csv_queue later in the same callback still sees the row
+            self._csv_queue.put_nowait(row)
+        else:
+            self._loop.call_soon_threadsafe(self._csv_queue.put_nowait, row)
+
+    def _drain_csv_queue(self, rows: list, limit: int = 64) -> list:
+        """Move queued trade rows into rows, up to limit."""
+        while len(rows) < limit and not self._csv_queue.empty():
+            rows.append(self._csv_queue.get_nowait())
+        return rows
+
+    async def _csv_writer(self):
+        """Write queued trade rows in batches, off the order update callback."""
+        while True:
+            rows = self._drain_csv_queue([await self._csv_queue.get()])
+            try:
+                write_trade_rows(self._exchange_name, self.ticker, rows)
+            except Exception as e:
+                self.logger.error(f"Error writing trade CSV: {e}")
+
+    def _flush_csv_queue(self):
+        """Stop the CSV writer task and synchronously write whatever is still queued."""
+        if self._csv_task is None:
+            return
+        self._csv_task.cancel()
+        self._csv_task = None
+        rows = self._drain_csv_queue([], limit=self._csv_queue.qsize())
+        if rows:
+            try:
+                write_trade_rows(self._exchange_name, self.ticker, rows)
+            except Exception as e:
+                self.logger.error(f"Error writing trade CSV: {e}")
 
     def _set_stop_flag(self, stop: bool):
         self.stop_flag = stop
         self.lighter.stop_flag = stop
+        self._status_event.set()
+        self._lighter_ready.set()
 
     def shutdown(self, signum=None, frame=None):
         """Graceful shutdown handler."""
         self._set_stop_flag(True)
         self.logger.info("\n🛑 Stopping...")
 
-        # Close WebSocket connections
-        if self.primary_client:
-            try:
-                # Note: disconnect() is async, but shutdown() is sync
-                # We'll let the cleanup happen naturally
-                self.logger.info(f"🔌 {self.primary_exchange_name()} WebSocket will be disconnected")
-            except Exception as e:
-                self.logger.error(f"Error disconnecting {self.primary_exchange_name()} WebSocket: {e}")
-
         # Cancel Lighter WebSocket task
         if self.lighter.lighter_ws_task and not self.lighter.lighter_ws_task.done():
             try:
@@ -258,6 +340,9 @@ class HedgeBotAbc(ABC):
             except Exception as e:
                 self.logger.error(f"Error cancelling Lighter WebSocket task: {e}")
 
+        # Flush pending trade CSV rows
+        self._flush_csv_queue()
+
         # Close logging handlers properly
         for handler in self.logger.handlers[:]:
             try:
@@ -266,25 +351,78 @@ class HedgeBotAbc(ABC):
             except Exception:
                 pass
 
+    async def _async_shutdown(self):
+        """Disconnect the Primary WebSocket, then run the synchronous shutdown."""
+        self._set_stop_flag(True)
+        if self.primary_client:
+            try:
+                await self.primary_client.disconnect()
+                self.logger.info(f"🔌 {self._exchange_name} WebSocket disconnected")
+            except Exception as e:
+                self.logger.error(f"Error disconnecting {self._exchange_name} WebSocket: {e}")
+        self.shutdown()
+
+    def _request_stop(self):
+        """Signal callback scheduled on the event loop; run() performs the cleanup."""
+        self.logger.info("\n🛑 Received stop signal...")
+        self._set_stop_flag(True)
+
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown."""
-        signal.signal(signal.SIGINT, self.shutdown)
-        signal.signal(signal.SIGTERM, self.shutdown)
+        try:
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(signal.SIGINT, self._request_stop)
+            loop.add_signal_handler(signal.SIGTERM, self._request_stop)
+        except (RuntimeError, NotImplementedError):
+            # No running loop, or platform without loop signal support (Windows)
+            signal.signal(signal.SIGINT, self.shutdown)
+            signal.signal(signal.SIGTERM, self.shutdown)
 
     async def fetch_primary_bbo_prices(self) -> Tuple[Decimal, Decimal]:
         """Fetch best bid/ask prices from Primary using REST API."""
         if not self.primary_client:
-            raise Exception(f"{self.primary_exchange_name()} client not initialized")
+            raise Exception(f"{self._exchange_name} client not initialized")
 
         best_bid, best_ask = await self.primary_client.fetch_bbo_prices(self.primary_contract_id)
 
         return best_bid, best_ask
 
+    def pushed_primary_bbo(self, max_age: float) -> Optional[Tuple[Decimal, Decimal]]:
+        """Return the WebSocket BBO if it is at most max_age seconds old, else None."""
+        if self._bbo_time is None or time.monotonic() - self._bbo_time > max_age:
+            return None
+        return self._best_bid, self._best_ask
+
+    async def _current_primary_bbo(self) -> Tuple[Decimal, Decimal]:
+        """Return the WebSocket BBO, falling back to REST when no fresh update is available."""
+        bbo = self.pushed_primary_bbo(_PUSHED_BBO_MAX_AGE)
+        if bbo is None:
+            return await self.fetch_primary_bbo_prices()
+        return bbo
+
+    @property
+    def primary_tick_size(self):
+        return self._primary_tick_size
+
+    @primary_tick_size.setter
+    def primary_tick_size(self, tick_size):
+        # Cache the reciprocal so round_to_tick multiplies instead of divides, but only when it is
+        # exact (e.g. 0.01 -> 100); a truncated one (0.03 -> 33.33...) can round to the wrong tick
+        self._primary_tick_size = tick_size
+        self._tick_inv = None
+        if tick_size is not None:
+            tick_inv = _ONE / tick_size
+            if tick_inv * tick_size == _ONE:
+                self._tick_inv = tick_inv
+
     def round_to_tick(self, price: Decimal) -> Decimal:
         """Round price to tick size."""
-        if self.primary_tick_size is None:
+        tick_size = self._primary_tick_size
+        if tick_size is None:
             return price
-        return (price / self.primary_tick_size).quantize(Decimal('1')) * self.primary_tick_size
+        if self._tick_inv is None:
+            return (price / tick_size).quantize(_ONE) * tick_size
+        return (price * self._tick_inv).quantize(_ONE) * tick_size
 
     async def place_bbo_order(self, side: str, quantity: Decimal):
         # Place the order using Primary client
@@ -302,61 +440,76 @@ class HedgeBotAbc(ABC):
     async def place_primary_post_only_order(self, side: str, quantity: Decimal):
         """Place a post-only order on Primary."""
         if not self.primary_client:
-            raise Exception(f"{self.primary_exchange_name()} client not initialized")
+            raise Exception(f"{self._exchange_name} client not initialized")
 
         self.primary_order_status = None
-        self.logger.info(f"[OPEN] [{self.primary_exchange_name()}] [{side}] Placing {self.primary_exchange_name()} POST-ONLY order")
+        self._status_event.clear()
+        self.logger.info(f"[OPEN] [{self._exchange_name}] [{side}] Placing {self._exchange_name} POST-ONLY order")
         order_id, order_price = await self.place_bbo_order(side, quantity)
 
         start_time = time.time()
         while not self.stop_flag:
+            # order_update_handler normalizes genuine cancels to 'CANCELED'; anything else
+            # that classifies as canceled (e.g. REJECTED) falls through to the error branch
+            status_class = classify_order_status(self.primary_order_status)
             if self.primary_order_status == 'CANCELED':
                 self.primary_order_status = 'NEW'
                 order_id, order_price = await self.place_bbo_order(side, quantity)
                 start_time = time.time()
-                await asyncio.sleep(0.5)
-            elif self.primary_order_status in ['NEW', 'OPEN', 'PENDING', 'CANCELING', 'PARTIALLY_FILLED']:
-                await asyncio.sleep(0.5)
-                # Check if we need to cancel and replace the order
-                should_cancel = False
-                best_bid, best_ask = await self.fetch_primary_bbo_prices()
-                if side == 'buy':
-                    if order_price < best_bid:
-                        should_cancel = True
-                else:
-                    if order_price > best_ask:
-                        should_cancel = True
+            elif status_class in _ACTIVE_STATUS:
+                # Only re-check the book once the order has rested for 10s
                 if time.time() - start_time > 10:
+                    should_cancel = False
+                    best_bid, best_ask = await self._current_primary_bbo()
+                    if side == 'buy':
+                        if order_price < best_bid:
+                            should_cancel = True
+                    else:
+                        if order_price > best_ask:
+                            should_cancel = True
                     if should_cancel:
                         try:
                             # Cancel the order using Primary client
                             cancel_result = await self.primary_client.cancel_order(order_id)
                             if not cancel_result.success:
-                                self.logger.error(f"❌ Error canceling {self.primary_exchange_name()} order: {cancel_result.error_message}")
+                                self.logger.error(
+                                    f"❌ Error canceling {self._exchange_name} order: {cancel_result.error_message}")
                         except Exception as e:
-                            self.logger.error(f"❌ Error canceling {self.primary_exchange_name()} order: {e}")
+                            self.logger.error(f"❌ Error canceling {self._exchange_name} order: {e}")
                     else:
                         self.logger.info(f"Order {order_id} is at best bid/ask, waiting for fill")
                         start_time = time.time()
-            elif self.primary_order_status == 'FILLED':
+            elif status_class is StatusClass.FILLED:
+                break
+            elif self.primary_order_status is not None:
+                self.logger.error(f"❌ Unknown {self._exchange_name} order status: {self.primary_order_status}")
                 break
-            else:
-                if self.primary_order_status is not None:
-                    self.logger.error(f"❌ Unknown {self.primary_exchange_name()} order status: {self.primary_order_status}")
-                    break
-                else:
-                    await asyncio.sleep(0.5)
 
-    def handle_primary_order_update(self, order_data):
-        """Handle Primary order updates from WebSocket."""
-        side = order_data.get('side', '').lower()
-        filled_size = Decimal(order_data.get('filled_size', '0'))
-        price = Decimal(order_data.get('price', '0'))
+            # Sleep until the next WS status update or the 10s reprice deadline
+            await self._wait_for_status_change(max(0.5, 10 - (time.time() - start_time)))
 
-        if side == 'buy':
-            lighter_side = 'sell'
+    async def _wait_for_status_change(self, timeout: float):
+        """Wait for order_update_handler to signal a status change, up to timeout seconds."""
+        try:
+            await asyncio.wait_for(self._status_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._status_event.clear()
+
+    def _set_event_threadsafe(self, event: asyncio.Event):
+        """Set an asyncio.Event from WS callbacks, which may run on SDK threads."""
+        if self._loop is None:
+            event.set()
         else:
-            lighter_side = 'buy'
+            self._loop.call_soon_threadsafe(event.set)
+
+    def _notify_status_change(self):
+        """Wake place_primary_post_only_order after a primary status change."""
+        self._set_event_threadsafe(self._status_event)
+
+    def handle_primary_order_update(self, side: str, filled_size: Decimal, price: Decimal):
+        """Handle a filled Primary order from WebSocket."""
+        lighter_side = _FLIP.get(side, 'buy')
 
         # Store order details for immediate execution
         self.current_lighter_side = lighter_side
@@ -364,14 +517,17 @@ class HedgeBotAbc(ABC):
         self.current_lighter_price = price
 
         self.waiting_for_lighter_fill = True
+        self._set_event_threadsafe(self._lighter_ready)
 
     def _reset_order_state(self):
         """重置订单执行状态"""
         self.order_execution_complete = False
         self.waiting_for_lighter_fill = False
+        self._lighter_ready.clear()
 
     async def _wait_for_lighter_execution(self, start_time: float) -> bool:
         """等待对冲订单执行完成，返回是否成功继续"""
+        deadline = start_time + 180
         while not self.order_execution_complete and not self.stop_flag:
             # Check if Primary order filled and we need to place Lighter order
             if self.waiting_for_lighter_fill:
@@ -382,10 +538,13 @@ class HedgeBotAbc(ABC):
                 )
                 break
 
-            await asyncio.sleep(0.01)
-            if time.time() - start_time > 180:
+            # Sleep until handle_primary_order_update (or stop) sets the event
+            try:
+                await asyncio.wait_for(self._lighter_ready.wait(), deadline - time.time())
+            except asyncio.TimeoutError:
                 self.logger.error("❌ Timeout waiting for trade completion")
                 return False
+            self._lighter_ready.clear()
         return not self.stop_flag
 
     async def _execute_hedge_position(self, side: str, quantity: Decimal) -> bool:
@@ -425,9 +584,9 @@ class HedgeBotAbc(ABC):
             self.logger.info(f"🔄 Trading loop iteration {iterations}")
             self.logger.info("-----------------------------------------------")
 
-            self.logger.info(f"[STEP 1] {self.primary_exchange_name()} position: {self.primary_position} | Lighter position: {self.lighter_position}")
+            self.logger.info(f"[STEP 1] {self._exchange_name} position: {self.primary_position} | Lighter position: {self.lighter_position}")
 
-            if abs(self.primary_position + self.lighter_position) > 0.2:
+            if abs(self.primary_position + self.lighter_position) > _MAX_POSITION_DIFF:
                 self.logger.error(f"❌ Position diff is too large: {self.primary_position + self.lighter_position}")
                 break
 
@@ -447,26 +606,39 @@ class HedgeBotAbc(ABC):
             close_side = 'sell' 
             if self.hedge_position_strategy:
                 await self.hedge_position_strategy.wait_close(self)
-                close_side = 'sell' if self.hedge_position_strategy.open_side == 'buy' else 'buy'
+                close_side = _FLIP.get(self.hedge_position_strategy.open_side, 'buy')
 
             # Step 2: 第一次平仓
-            self.logger.info(f"[STEP 2] {self.primary_exchange_name()} position: {self.primary_position} | Lighter position: {self.lighter_position}")
+            self.logger.info(f"[STEP 2] {self._exchange_name} position: {self.primary_position} | Lighter position: {self.lighter_position}")
             if not await self._execute_hedge_position(close_side, self.order_quantity):
                 break
 
             # Step 3: 剩余平仓
-            self.logger.info(f"[STEP 3] {self.primary_exchange_name()} position: {self.primary_position} | Lighter position: {self.lighter_position}")
+            self.logger.info(f"[STEP 3] {self._exchange_name} position: {self.primary_position} | Lighter position: {self.lighter_position}")
             final_close_side, final_close_quantity = self._determine_close_side_and_quantity()
             if final_close_side:
                 if not await self._execute_hedge_position(final_close_side, final_close_quantity):
                     break
 
+    @staticmethod
+    async def _run_concurrently(*coros):
+        """Run startup coroutines concurrently; cancel the rest if one fails (TaskGroup semantics on 3.10)."""
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
     async def run(self):
         """Run the hedge bot."""
         self.setup_signal_handlers()
 
+        self._csv_task = asyncio.create_task(self._csv_writer())
+
         try:
-            await asyncio.gather(
+            await self._run_concurrently(
                 self._init_primary_contract_info(),
                 self._setup_primary_websocket(),
                 self.lighter.setup_ws_task()
@@ -479,7 +651,7 @@ class HedgeBotAbc(ABC):
             self.logger.error(f"❌ Full traceback: {traceback.format_exc()}")
         finally:
             self.logger.info("🔄 Cleaning up...")
-            self.shutdown()
+            await self._async_shutdown()
 
 
 def parse_arguments():
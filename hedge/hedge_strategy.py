@@ -1,7 +1,38 @@
 from abc import ABC, abstractmethod
 import time
 import random
+import statistics
 import asyncio
+import functools
+import logging
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager
+from decimal import Decimal
+
+# 离群样本判定：偏离中位数超过 3 × 1.4826 × MAD（正态分布下约3σ）
+OUTLIER_MAD_SCALE = Decimal('4.4478')
+
+# 同一进程内多个对冲机器人共享的单交易所并发上限，平滑轮询时的请求突发
+EXCHANGE_CONCURRENCY = 4
+_exchange_semaphores = weakref.WeakKeyDictionary()  # event loop -> {exchange: Semaphore}
+
+
+def _exchange_semaphore(name):
+    """按事件循环惰性创建交易所信号量（避免模块导入时绑定到错误的loop）"""
+    per_loop = _exchange_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = per_loop.get(name)
+    if semaphore is None:
+        semaphore = per_loop[name] = asyncio.Semaphore(EXCHANGE_CONCURRENCY)
+    return semaphore
+
+
+@asynccontextmanager
+async def _exchange_slots(*names):
+    """按固定顺序占用各交易所的并发名额，多名额获取不会互相死锁"""
+    async with AsyncExitStack() as stack:
+        for name in sorted(set(names)):
+            await stack.enter_async_context(_exchange_semaphore(name))
+        yield
 
 
 class HedgeStrategy(ABC):
@@ -21,37 +52,99 @@ class HedgeStrategy(ABC):
         pass
 
 
+class _PushedBBOClient:
+    """Primary盘口来源：WebSocket推送的BBO足够新时直接使用，否则回退REST请求"""
+
+    def __init__(self, hedge_bot, max_age):
+        self.config = hedge_bot.primary_client.config
+        self._hedge_bot = hedge_bot
+        self._max_age = max_age
+
+    async def fetch_bbo_prices(self, contract_id):
+        bbo = self._hedge_bot.pushed_primary_bbo(self._max_age)
+        if bbo is not None:
+            return bbo
+        return await self._hedge_bot.primary_client.fetch_bbo_prices(contract_id)
+
+
 class SpreadSampler:
     """价差采样和分析器"""
     
-    def __init__(self, sample_count_range=(10, 20), cache_duration=300):
+    def __init__(self, sample_count_range=(10, 20), cache_duration=300, profit_threshold=0.05,
+                 min_samples=3, convergence_tolerance=Decimal('0.01'), reuse_window=0.2,
+                 ewma_alpha=0.1, invalidation_ratio=0.3, max_cache_extension=4, fetch_timeout=5.0,
+                 min_flat_samples=8):
         self.sample_count_range = sample_count_range
         self.cache_duration = cache_duration  # 缓存5分钟
-        self.spread_history = []
+        self.min_samples = min_samples
+        self.convergence_tolerance = convergence_tolerance  # 相对标准误低于该值时提前停止采样
+        self.min_flat_samples = min_flat_samples  # 样本完全相同（方差为0）时，至少采满该数量才视为收敛
+        self.spread_history = []  # 仅保存价差数值（Decimal），完整盘口只保留最近一次
+        self.last_sample = None
+        self.last_sample_time = None  # last_sample的采集时间（monotonic）
+        self.reuse_window = reuse_window  # 决策轮询可直接复用该时间窗内的最近样本
+        self.fetch_timeout = fetch_timeout  # 双边盘口请求的总超时（秒），超时即取消两边请求
         self.average_spread = None
-        self.last_update_time = None
+        self.last_update_time = None  # monotonic时间，仅用于缓存有效期判断
         self.logger = None
+        # 近期价差EWMA：偏离平均价差超过invalidation_ratio时缓存失效，偏离很小时缓存最多延长到max_cache_extension倍
+        self.recent_spread_ewma = None
+        self._ewma_alpha = Decimal(str(ewma_alpha))
+        self.invalidation_ratio = Decimal(str(invalidation_ratio))
+        self.max_cache_extension = max_cache_extension
+        self._set_profit_threshold(profit_threshold)
+
+    def _set_profit_threshold(self, profit_threshold):
+        """预计算平仓阈值系数 (1 - profit_threshold)，避免每次轮询重复构造Decimal"""
+        self._profit_threshold = profit_threshold
+        self._one_minus_threshold = Decimal('1') - Decimal(str(profit_threshold))
     
-    async def sample_current_spread(self, primary_client, lighter_proxy):
-        """采样当前双边价差"""
+    async def sample_current_spread(self, primary_client, lighter_proxy, contract_id=None, max_age=None):
+        """采样当前双边价差
+
+        contract_id 为调用方预先取得的Primary合约ID；未提供时从 primary_client.config 读取。
+        max_age 不为None时，若最近一次样本不超过max_age秒则直接返回，不再发起请求。
+        """
+        if (max_age is not None and self.last_sample_time is not None
+                and time.monotonic() - self.last_sample_time < max_age):
+            return self.last_sample
+        if contract_id is None:
+            contract_id = primary_client.config.contract_id
         try:
-            results = await asyncio.gather(
-                # 获取EdgeX最优买卖价 - 需要传入contract_id
-                primary_client.fetch_bbo_prices(primary_client.config.contract_id),
-                # 获取Lighter最优买卖价 - 通过lighter_proxy获取
-                lighter_proxy.fetch_bbo_prices()
-            )
-            primary_bid, primary_ask = results[0]
-            lighter_bid, lighter_ask = results[1]
+            # return_exceptions=True：等待双边都返回，单边失败不会遗留未取回异常的任务
+            async with _exchange_slots('primary', 'lighter'):
+                primary_result, lighter_result = await asyncio.wait_for(asyncio.gather(
+                    # 获取EdgeX最优买卖价 - 需要传入contract_id
+                    primary_client.fetch_bbo_prices(contract_id),
+                    # 获取Lighter最优买卖价 - 通过lighter_proxy获取
+                    lighter_proxy.fetch_bbo_prices(),
+                    return_exceptions=True
+                ), timeout=self.fetch_timeout)
+            if isinstance(primary_result, BaseException):
+                if isinstance(lighter_result, BaseException) and self.logger:
+                    self.logger.warning("Lighter盘口获取同样失败: %s", lighter_result)
+                raise primary_result
+            if isinstance(lighter_result, BaseException):
+                raise lighter_result
+            primary_bid, primary_ask = primary_result
+            lighter_bid, lighter_ask = lighter_result
             
             # 计算价差：价格低的开多，价格高的开空
             primary_mid = (primary_bid + primary_ask) / 2
             lighter_mid = (lighter_bid + lighter_ask) / 2
             
-            spread = abs(primary_mid - lighter_mid)
+            delta = primary_mid - lighter_mid
+            spread = abs(delta)
+            if self.recent_spread_ewma is None:
+                self.recent_spread_ewma = spread
+            else:
+                self.recent_spread_ewma += self._ewma_alpha * (spread - self.recent_spread_ewma)
             
-            return {
+            self.last_sample_time = time.monotonic()
+            self.last_sample = {
                 'spread': spread,
+                # 开仓方向随样本一次确定：Primary价格更低则Primary开多
+                'open_side': 'buy' if delta < 0 else 'sell',
                 'primary_mid': primary_mid,
                 'lighter_mid': lighter_mid,
                 'primary_bid': primary_bid,
@@ -60,51 +153,100 @@ class SpreadSampler:
                 'lighter_ask': lighter_ask,
                 'timestamp': time.time()
             }
+            return self.last_sample
         except Exception as e:
             if self.logger:
-                self.logger.error(f"采样价差失败: {e}")
+                self.logger.error("采样价差失败: %s", e)
             raise
     
-    async def calculate_average_spread(self, primary_client, lighter_proxy, force_refresh=False):
+    async def calculate_average_spread(self, primary_client, lighter_proxy, force_refresh=False, contract_id=None):
         """计算平均价差，支持缓存"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # 检查缓存是否有效
-        if not force_refresh and self.average_spread is not None:
-            if self.last_update_time and (current_time - self.last_update_time) < self.cache_duration:
-                return self.average_spread
+        if not force_refresh and self._is_cache_valid(current_time):
+            return self.average_spread
         
         # 确定采样次数
         sample_count = random.randint(*self.sample_count_range)
         self.spread_history = []
         
         if self.logger:
-            self.logger.info(f"🔍 开始价差采样，目标样本数: {sample_count}")
+            self.logger.info("🔍 开始价差采样，目标样本数: %s", sample_count)
         
-        # 采样循环
+        # 采样循环：Welford在线更新均值/方差，均值的相对标准误足够小时提前结束
+        n = 0
+        mean = Decimal('0')
+        m2 = Decimal('0')
         for i in range(sample_count):
+            # 采样间隔随机化，避免固定模式；间隔从本次请求发出时起算，网络往返与等待重叠
+            next_sample_at = time.monotonic() + random.uniform(0.5, 2.0) if i < sample_count - 1 else None
             try:
-                sample = await self.sample_current_spread(primary_client, lighter_proxy)
-                self.spread_history.append(sample)
-                
-                # 采样间隔随机化，避免固定模式
-                await asyncio.sleep(random.uniform(0.5, 2.0))
-                
+                sample = await self.sample_current_spread(primary_client, lighter_proxy, contract_id)
             except Exception as e:
                 if self.logger:
-                    self.logger.warning(f"采样失败 {i+1}/{sample_count}: {e}")
+                    self.logger.warning("采样失败 %s/%s: %s", i + 1, sample_count, e)
                 continue
+
+            spread = sample['spread']
+            self.spread_history.append(spread)
+            n += 1
+            delta = spread - mean
+            mean += delta / n
+            m2 += delta * (spread - mean)
+
+            if n >= self.min_samples and self._has_converged(n, mean, m2):
+                if self.logger:
+                    self.logger.info("📉 价差均值已收敛，提前结束采样 (%s/%s)", n, sample_count)
+                break
+
+            if next_sample_at is not None:
+                await asyncio.sleep(max(0, next_sample_at - time.monotonic()))
         
-        if len(self.spread_history) >= 3:  # 最少3个有效样本
-            spreads = [s['spread'] for s in self.spread_history]
-            self.average_spread = sum(spreads) / len(spreads)
+        if n >= self.min_samples:  # 最少3个有效样本
+            self.average_spread = self._robust_mean(self.spread_history, mean)
             self.last_update_time = current_time
             
             if self.logger:
-                self.logger.info(f"📊 价差采样完成: {len(spreads)}个样本, 平均价差: {self.average_spread:.6f}")
+                self.logger.info("📊 价差采样完成: %s个样本, 平均价差: %.6f", n, self.average_spread)
             return self.average_spread
         else:
             raise Exception("采样失败：有效样本不足")
+
+    @staticmethod
+    def _robust_mean(spreads, mean):
+        """剔除基于中位数/MAD判定的离群样本后求均值；无离群样本时直接返回已有均值"""
+        median = statistics.median(spreads)
+        mad = statistics.median(abs(spread - median) for spread in spreads)
+        if not mad:
+            return mean
+        limit = OUTLIER_MAD_SCALE * mad
+        kept = [spread for spread in spreads if abs(spread - median) <= limit]
+        if len(kept) == len(spreads):
+            return mean
+        return sum(kept) / len(kept)
+
+    def _is_cache_valid(self, now):
+        """平均价差缓存是否仍可用：近期价差未明显偏离时延长缓存，偏离过大时立即失效"""
+        if self.average_spread is None or not self.last_update_time:
+            return False
+        age = now - self.last_update_time
+        if self.recent_spread_ewma is None or not self.average_spread:
+            return age < self.cache_duration
+        drift = abs(self.recent_spread_ewma - self.average_spread) / self.average_spread
+        if drift >= self.invalidation_ratio:
+            return False
+        return age < self.cache_duration * self.max_cache_extension
+
+    def _has_converged(self, n, mean, m2):
+        """均值标准误 / 均值 低于容差即视为收敛
+
+        几个相同的样本（盘口未变动）说明不了价差稳定，方差为0时需采满min_flat_samples个样本
+        """
+        stderr = (m2 / (n - 1) / n).sqrt()
+        if stderr == 0:
+            return n >= self.min_flat_samples
+        return mean != 0 and stderr / abs(mean) < self.convergence_tolerance
     
     def should_open_by_spread(self, current_spread):
         """基于价差判断是否应该开仓"""
@@ -112,21 +254,16 @@ class SpreadSampler:
             return False
         return current_spread > self.average_spread
     
-    def should_close_by_spread(self, current_spread, profit_threshold=0.05):
+    def should_close_by_spread(self, current_spread, profit_threshold=None):
         """基于价差判断是否应该平仓"""
         if self.average_spread is None:
             return False
-        
-        # 确保profit_threshold是Decimal类型
-        from decimal import Decimal
-        if not isinstance(profit_threshold, Decimal):
-            profit_threshold = Decimal(str(profit_threshold))
-        
+
+        if profit_threshold is not None and profit_threshold != self._profit_threshold:
+            self._set_profit_threshold(profit_threshold)
+
         # 价差缩小到平均价差内，且满足盈利阈值
-        spread_condition = current_spread <= self.average_spread
-        profit_condition = current_spread > self.average_spread * (Decimal('1') - profit_threshold)
-        
-        return spread_condition and profit_condition
+        return self.average_spread * self._one_minus_threshold < current_spread <= self.average_spread
 
 
 class TimingController:
@@ -148,18 +285,18 @@ class TimingController:
         self.next_open_time = self.last_close_time + (wait_minutes * 60)
         
         if self.logger:
-            self.logger.info(f"⏰ 下次开仓时间: {wait_minutes:.1f}分钟后")
+            self.logger.info("⏰ 下次开仓时间: %.1f分钟后", wait_minutes)
         return False
     
     def schedule_next_close(self, min_minutes=30, max_minutes=240):
         """调度下次平仓时间"""
         wait_minutes = random.uniform(min_minutes, max_minutes)
-        self.next_close_time = time.time() + (wait_minutes * 60)
+        self.next_close_time = time.monotonic() + (wait_minutes * 60)
         
         if self.logger:
-            self.logger.info(f"⏰ 预计平仓时间: {wait_minutes:.1f}分钟后")
+            self.logger.info("⏰ 预计平仓时间: %.1f分钟后", wait_minutes)
     
-    def can_open_by_time(self):
+    def can_open_by_time(self, now=None):
         """基于时间判断是否可以开仓"""
         if self.is_first_trade:
             return True
@@ -167,18 +304,26 @@ class TimingController:
         if self.next_open_time is None:
             return True
         
-        return time.time() >= self.next_open_time
+        return (time.monotonic() if now is None else now) >= self.next_open_time
     
-    def should_close_by_time(self):
+    def should_close_by_time(self, now=None):
         """基于时间判断是否应该平仓"""
         if self.next_close_time is None:
             return False
         
-        return time.time() >= self.next_close_time
+        return (time.monotonic() if now is None else now) >= self.next_close_time
+    
+    def remaining_to_open(self, now):
+        """距计划开仓时间的剩余秒数，未调度时为0"""
+        return max(0.0, self.next_open_time - now) if self.next_open_time else 0.0
+    
+    def remaining_to_close(self, now):
+        """距计划平仓时间的剩余秒数，未调度时为0"""
+        return max(0.0, self.next_close_time - now) if self.next_close_time else 0.0
     
     def record_close(self):
         """记录平仓时间"""
-        self.last_close_time = time.time()
+        self.last_close_time = time.monotonic()
         self.is_first_trade = False
         self.next_close_time = None
 
@@ -195,15 +340,34 @@ class SmartHedgeStrategy(HedgeStrategy):
                  sleep_time=30,
                  risk_threshold=0.20,
                  max_open_wait_minutes=30,
-                 max_close_wait_minutes=60):
+                 max_close_wait_minutes=60,
+                 liquidation_cache_ttl=15,
+                 liquidation_far_ttl=300,
+                 liquidation_fetch_timeout=2.0,
+                 min_poll_interval=1.0,
+                 wake_spread_ratio=0.1,
+                 wait_log_interval=60,
+                 bbo_max_age=0.25):
         super().__init__() 
         
         # 初始化核心组件
-        self.spread_sampler = SpreadSampler(sample_count_range, cache_duration)
+        self.spread_sampler = SpreadSampler(sample_count_range, cache_duration, profit_threshold)
         self.timing_controller = TimingController()
         self.sleep_time = sleep_time
+        self.min_poll_interval = min_poll_interval  # 盘口推送唤醒时的最小轮询间隔
+        # Lighter中间价相对上次样本的变动超过平均价差的该比例时才提前唤醒
+        self.wake_spread_ratio = Decimal(str(wake_spread_ratio))
+        self.wait_log_interval = wait_log_interval  # 等待中日志的最小间隔（秒）
+        self._last_wait_log_time = None
+        self.bbo_max_age = bbo_max_age  # 推送盘口的最大可用时长（秒）
         
         self.risk_threshold = risk_threshold
+        self.liquidation_cache_ttl = liquidation_cache_ttl
+        # 远离清算线（距离超过2倍risk_threshold）时缓存可延长到liquidation_far_ttl秒；新持仓时清空
+        self.liquidation_far_ttl = liquidation_far_ttl
+        self._liquidation_cache = {}  # name -> (清算价格, 获取时间)
+        # 单边清算价格请求的超时（秒），超时按获取失败处理，不拖住另一边
+        self.liquidation_fetch_timeout = liquidation_fetch_timeout
         # 配置参数
         self.profit_threshold = profit_threshold
         self.open_wait_range = open_wait_range
@@ -214,11 +378,27 @@ class SmartHedgeStrategy(HedgeStrategy):
         # 状态记录
         self.open_decision_start_time = None    # 开仓决策开始时间
         self.close_decision_start_time = None   # 平仓决策开始时间
+        self._primary_contract_id = None        # 由_setup_logger在决策开始时填充
+        self._sample = None                     # 绑定双边客户端的采样函数
+        self._calc_avg = None                   # 绑定双边客户端的平均价差函数
     
     def _setup_logger(self, hedge_bot):
         """设置logger引用"""
         self.spread_sampler.logger = hedge_bot.logger
         self.timing_controller.logger = hedge_bot.logger
+        # 合约ID与双边客户端在运行期间不变，取一次并绑定到采样函数，轮询时零参数调用
+        self._primary_contract_id = hedge_bot.primary_client.config.contract_id
+        # 优先使用机器人维护的WebSocket推送Primary盘口（HedgeBotAbc.pushed_primary_bbo），不够新时回退REST
+        primary_source = _PushedBBOClient(hedge_bot, self.bbo_max_age)
+        self._sample = functools.partial(
+            self.spread_sampler.sample_current_spread,
+            primary_source, hedge_bot.lighter, self._primary_contract_id,
+            max_age=self.spread_sampler.reuse_window
+        )
+        self._calc_avg = functools.partial(
+            self.spread_sampler.calculate_average_spread,
+            primary_source, hedge_bot.lighter, contract_id=self._primary_contract_id
+        )
     
     async def wait_open(self, hedge_bot):
         """智能开仓决策：等待价差+时间双维度条件满足"""
@@ -227,7 +407,8 @@ class SmartHedgeStrategy(HedgeStrategy):
         
         # 初始化开仓决策开始时间
         if self.open_decision_start_time is None:
-            self.open_decision_start_time = time.time()
+            self.open_decision_start_time = time.monotonic()
+            self._last_wait_log_time = None
         
         logger.info("⏳ 开始开仓决策...")
         
@@ -236,88 +417,155 @@ class SmartHedgeStrategy(HedgeStrategy):
                 # 第一次开仓：初始化平均价差
                 if self.timing_controller.is_first_trade:
                     logger.info("🎯 第一次开仓：初始化价差基准")
-                    await self.spread_sampler.calculate_average_spread(
-                        hedge_bot.primary_client, hedge_bot.lighter, force_refresh=True
-                    )
+                    await self._calc_avg(force_refresh=True)
+                else:
+                    # 此后由缓存有效性（TTL + 近期价差EWMA漂移）决定是否重新采样基准；
+                    # 平仓阶段不刷新，始终以开仓时的基准判断
+                    await self._calc_avg()
                 
                 # 统一的开仓逻辑：价差+时间双维度判断
                 # 获取当前价差
-                current_sample = await self.spread_sampler.sample_current_spread(
-                    hedge_bot.primary_client, hedge_bot.lighter
-                )
+                current_sample = await self._sample()
                 current_spread = current_sample['spread']
+                now = time.monotonic()  # 本轮决策统一使用的时间点
                 
                 # 维度1：价差判断
                 spread_favorable = self.spread_sampler.should_open_by_spread(current_spread)
                 
                 if spread_favorable:
-                    logger.info(f"✅ 价差维度满足：当前{current_spread:.6f} > 平均{self.spread_sampler.average_spread:.6f}")
+                    logger.info("✅ 价差维度满足：当前%.6f > 平均%.6f", current_spread, self.spread_sampler.average_spread)
                     
-                    # 确定开仓方向
-                    if current_sample['primary_mid'] < current_sample['lighter_mid']:
-                        self.open_side = 'buy'
-                    else:
-                        self.open_side = 'sell'
-
-                    self.timing_controller.schedule_next_close(*self.close_wait_range)
-                    self._reset_open_decision_time()
+                    self._commit_open(current_sample)
                     return  # 条件满足，退出等待
                 
                 # 维度2：时间判断
-                elif self.timing_controller.can_open_by_time():
+                elif self.timing_controller.can_open_by_time(now):
                     logger.info("⏰ 时间维度满足：到达预定开仓时间")
                     
-                    # 时间驱动的开仓也需要确定方向
-                    if current_sample['primary_mid'] < current_sample['lighter_mid']:
-                        self.open_side = 'buy'
-                    else:
-                        self.open_side = 'sell'
-                    
-                    self.timing_controller.schedule_next_close(*self.close_wait_range)
-                    self._reset_open_decision_time()
+                    self._commit_open(current_sample)
                     return  # 条件满足，退出等待
                 
                 # 维度3：超时保护 - 策略内部处理最大等待时间
-                elif self._is_open_timeout():
-                    logger.warning(f"⏰ 超时保护触发：已等待{(time.time() - self.open_decision_start_time)/60:.1f}分钟，强制开仓")
-                    
-                    # 超时情况下也需要确定方向
-                    if current_sample['primary_mid'] < current_sample['lighter_mid']:
-                        self.open_side = 'buy'
-                    else:
-                        self.open_side = 'sell'
+                elif self._is_open_timeout(now):
+                    logger.warning("⏰ 超时保护触发：已等待%.1f分钟，强制开仓", (now - self.open_decision_start_time) / 60)
                     
-                    self.timing_controller.schedule_next_close(*self.close_wait_range)
-                    self._reset_open_decision_time()
+                    self._commit_open(current_sample)
                     return  # 超时保护，退出等待
                 
                 else:
-                    time_remaining = max(0, self.timing_controller.next_open_time - time.time()) if self.timing_controller.next_open_time else 0
-                    wait_elapsed = (time.time() - self.open_decision_start_time) / 60
-                    logger.info(f"⏸️ 等待中：价差不利且时间未到 (已等待{wait_elapsed:.1f}分钟，还需{time_remaining/60:.1f}分钟)")
+                    if self._should_log_wait(now) and logger.isEnabledFor(logging.INFO):
+                        logger.info("⏸️ 等待中：价差不利且时间未到 (已等待%.1f分钟，还需%.1f分钟)",
+                                    (now - self.open_decision_start_time) / 60,
+                                    self.timing_controller.remaining_to_open(now) / 60)
                     
-                    await asyncio.sleep(self.sleep_time)
+                    await self._sleep_until_tick(hedge_bot, self._poll_delay(
+                        now, self.timing_controller.next_open_time, self._open_deadline()
+                    ))
                         
             except Exception as e:
-                logger.error(f"❌ 开仓策略执行失败: {e}")
-                # 出错时也触发超时保护
-                if self._is_open_timeout():
-                    logger.warning("⚠️ 策略执行失败且超时，强制开仓")
-                    self._reset_open_decision_time()
+                if await self._recover_from_error(
+                    logger, e, "开仓", self._is_open_timeout, self._reset_open_decision_time, self._open_deadline
+                ):
                     return  # 超时保护，退出等待
-                # 出错时等待后重试
-                await asyncio.sleep(self.sleep_time)
         
         # 如果stop_flag被设置，抛出异常通知调用者停止
         raise asyncio.CancelledError("开仓等待被中断")
     
-    def _is_open_timeout(self) -> bool:
+    def _commit_open(self, current_sample):
+        """确定开仓方向（价格低的一边开多），调度平仓时间并结束本轮开仓决策"""
+        self.open_side = current_sample['open_side']
+        self.timing_controller.schedule_next_close(*self.close_wait_range)
+        self._reset_open_decision_time()
+
+    async def _recover_from_error(self, logger, error, action, is_timeout, reset_decision, deadline):
+        """开/平仓决策循环共用的出错处理：已超时则强制结束决策并返回True，否则等待后返回False以重试"""
+        logger.error("❌ %s策略执行失败: %s", action, error)
+        # 出错时也触发超时保护
+        if is_timeout():
+            logger.warning("⚠️ 策略执行失败且超时，强制%s", action)
+            reset_decision()
+            return True
+        # 出错时等待后重试，超时截止点先到则提前醒来
+        await asyncio.sleep(self._poll_delay(time.monotonic(), deadline()))
+        return False
+
+    def _poll_delay(self, now, *deadlines) -> float:
+        """轮询间隔：不超过sleep_time，且在最近的截止时间点（计划开/平仓或超时）及时醒来"""
+        remaining = [deadline - now for deadline in deadlines if deadline is not None]
+        if not remaining:
+            return self.sleep_time
+        return min(self.sleep_time, max(0.1, min(remaining)))
+
+    def _should_log_wait(self, now):
+        """等待中日志节流：每个决策的第一次以及此后每wait_log_interval秒最多输出一次"""
+        if self._last_wait_log_time is not None and now - self._last_wait_log_time < self.wait_log_interval:
+            return False
+        self._last_wait_log_time = now
+        return True
+
+    async def _sleep_until_tick(self, hedge_bot, delay):
+        """等待至多delay秒，Lighter盘口明显变化时提前醒来
+
+        至少间隔min_poll_interval才响应盘口推送，且只有Lighter中间价相对上次样本的变动
+        超过 wake_spread_ratio × 平均价差 时才唤醒，避免每个tick都触发一次Primary REST请求。
+        没有盘口事件的对冲机器人退化为固定休眠。
+        """
+        lighter = hedge_bot.lighter
+        event = getattr(lighter, 'bbo_changed', None)
+        if not isinstance(event, asyncio.Event) or delay <= self.min_poll_interval:
+            await asyncio.sleep(delay)
+            return
+        deadline = time.monotonic() + delay
+        event.clear()
+        await asyncio.sleep(self.min_poll_interval)
+        while True:
+            if event.is_set():
+                event.clear()
+                if self._lighter_moved(lighter):
+                    return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+
+    def _lighter_moved(self, lighter):
+        """Lighter推送盘口的中间价相对上次样本的变动是否足以改变开/平仓判断"""
+        sample = self.spread_sampler.last_sample
+        average_spread = self.spread_sampler.average_spread
+        bid, ask = lighter.lighter_best_bid, lighter.lighter_best_ask
+        if sample is None or not average_spread or bid is None or ask is None:
+            return True
+        moved = abs((bid + ask) / 2 - sample['lighter_mid'])
+        return moved >= self.wake_spread_ratio * average_spread
+
+    def _open_deadline(self):
+        """开仓超时保护的绝对截止时间（monotonic），未开始决策时为None"""
+        if self.open_decision_start_time is None:
+            return None
+        return self.open_decision_start_time + self.max_open_wait_minutes * 60
+
+    def _close_deadline(self):
+        """平仓超时保护的绝对截止时间（monotonic），未开始决策时为None"""
+        if self.close_decision_start_time is None:
+            return None
+        return self.close_decision_start_time + self.max_close_wait_minutes * 60
+
+    def _is_open_timeout(self, now=None) -> bool:
         """检查是否超过最大开仓等待时间"""
         if self.open_decision_start_time is None:
             return False
-        elapsed_minutes = (time.time() - self.open_decision_start_time) / 60
+        elapsed_minutes = ((time.monotonic() if now is None else now) - self.open_decision_start_time) / 60
         return elapsed_minutes >= self.max_open_wait_minutes
     
+    def _commit_close(self):
+        """记录平仓、调度下次开仓时间并结束本轮平仓决策"""
+        self.timing_controller.record_close()
+        self.timing_controller.schedule_next_open(*self.open_wait_range)
+        self._reset_close_decision_time()
+
     def _reset_open_decision_time(self):
         """重置开仓决策时间"""
         self.open_decision_start_time = None
@@ -329,87 +577,135 @@ class SmartHedgeStrategy(HedgeStrategy):
         
         # 初始化平仓决策开始时间
         if self.close_decision_start_time is None:
-            self.close_decision_start_time = time.time()
+            self.close_decision_start_time = time.monotonic()
+            self._last_wait_log_time = None
+            # 新持仓的清算价格与上一轮不同，丢弃缓存
+            self._liquidation_cache.clear()
         
         logger.info("⏳ 开始平仓决策...")
         
         while not hedge_bot.stop_flag:
             try:
-                # 获取当前价差
-                current_sample = await self.spread_sampler.sample_current_spread(
-                    hedge_bot.primary_client, hedge_bot.lighter
+                # 价差采样与双边清算价格在同一批并发请求中获取，避免两次串行网络往返
+                current_sample, liquidation_results = await asyncio.gather(
+                    self._sample(),
+                    self._fetch_liquidation_prices(hedge_bot),
+                    return_exceptions=True
                 )
+                if isinstance(current_sample, BaseException):
+                    raise current_sample
                 current_spread = current_sample['spread']
+                now = time.monotonic()  # 本轮决策统一使用的时间点
                 
                 # 🚨 风险控制检查：优先级最高，先检查爆仓风险
                 risk_control_triggered = await self._check_liquidation_risk(
-                    hedge_bot, current_sample
+                    hedge_bot, current_sample, liquidation_results
                 )
                 
                 if risk_control_triggered:
                     logger.warning("🚨 风险控制触发：价格接近清算线，立即双边平仓")
-                    self.timing_controller.record_close()
-                    self.timing_controller.schedule_next_open(*self.open_wait_range)
-                    self._reset_close_decision_time()
+                    self._commit_close()
                     return  # 风险控制优先，立即退出
                 
                 # 维度1：价差+盈利判断
-                spread_should_close = self.spread_sampler.should_close_by_spread(
-                    current_spread, self.profit_threshold
-                )
+                spread_should_close = self.spread_sampler.should_close_by_spread(current_spread)
                 
                 if spread_should_close:
-                    logger.info(f"✅ 价差维度满足平仓：当前{current_spread:.6f} <= 平均{self.spread_sampler.average_spread:.6f}且满足盈利阈值")
-                    self.timing_controller.record_close()
-                    self.timing_controller.schedule_next_open(*self.open_wait_range)
-                    self._reset_close_decision_time()
+                    logger.info("✅ 价差维度满足平仓：当前%.6f <= 平均%.6f且满足盈利阈值", current_spread, self.spread_sampler.average_spread)
+                    self._commit_close()
                     return  # 条件满足，退出等待
                 
                 # 维度2：时间判断
-                elif self.timing_controller.should_close_by_time():
+                elif self.timing_controller.should_close_by_time(now):
                     logger.info("⏰ 时间维度满足：到达预定平仓时间")
-                    self.timing_controller.record_close()
-                    self.timing_controller.schedule_next_open(*self.open_wait_range)
-                    self._reset_close_decision_time()
+                    self._commit_close()
                     return  # 条件满足，退出等待
                 
                 # 维度3：超时保护 - 策略内部处理最大等待时间
-                elif self._is_close_timeout():
-                    logger.warning(f"⏰ 超时保护触发：已等待{(time.time() - self.close_decision_start_time)/60:.1f}分钟，强制平仓")
-                    self.timing_controller.record_close()
-                    self.timing_controller.schedule_next_open(*self.open_wait_range)
-                    self._reset_close_decision_time()
+                elif self._is_close_timeout(now):
+                    logger.warning("⏰ 超时保护触发：已等待%.1f分钟，强制平仓", (now - self.close_decision_start_time) / 60)
+                    self._commit_close()
                     return  # 超时保护，退出等待
                 
                 else:
-                    time_remaining = max(0, self.timing_controller.next_close_time - time.time()) if self.timing_controller.next_close_time else 0
-                    wait_elapsed = (time.time() - self.close_decision_start_time) / 60
-                    logger.info(f"⏸️ 继续持仓：价差不利且时间未到 (已等待{wait_elapsed:.1f}分钟，还需{time_remaining/60:.1f}分钟)")
+                    if self._should_log_wait(now) and logger.isEnabledFor(logging.INFO):
+                        logger.info("⏸️ 继续持仓：价差不利且时间未到 (已等待%.1f分钟，还需%.1f分钟)",
+                                    (now - self.close_decision_start_time) / 60,
+                                    self.timing_controller.remaining_to_close(now) / 60)
 
-                    await asyncio.sleep(self.sleep_time)
+                    await self._sleep_until_tick(hedge_bot, self._poll_delay(
+                        now, self.timing_controller.next_close_time, self._close_deadline()
+                    ))
 
             except Exception as e:
-                logger.error(f"❌ 平仓策略执行失败: {e}")
-                # 出错时也触发超时保护
-                if self._is_close_timeout():
-                    logger.warning("⚠️ 策略执行失败且超时，强制平仓")
-                    self._reset_close_decision_time()
+                if await self._recover_from_error(
+                    logger, e, "平仓", self._is_close_timeout, self._reset_close_decision_time, self._close_deadline
+                ):
                     return  # 超时保护，退出等待
-                # 出错时等待后重试
-                await asyncio.sleep(self.sleep_time)
         
         # 如果stop_flag被设置，抛出异常通知调用者停止
         raise asyncio.CancelledError("平仓等待被中断")
     
-    async def _check_liquidation_risk(self, hedge_bot, current_sample):
-        """检查清算风险：当盘口价格接近任意一边清算价格的80%时触发风险控制"""
+    async def _fetch_liquidation_prices(self, hedge_bot):
+        """并行获取双边清算价格，单边失败以异常对象返回
+
+        清算价格随保证金变化缓慢，成功结果按交易所缓存liquidation_cache_ttl秒，命中时不发起网络请求。
+        最近样本的盘口价格远离缓存的清算价格时，缓存延长到liquidation_far_ttl秒。
+        每边请求单独受liquidation_fetch_timeout限制，超时以asyncio.TimeoutError返回。
+        """
+        now = time.monotonic()
+        sources = (
+            ('primary', hedge_bot.primary_client),
+            ('lighter', hedge_bot.lighter),
+        )
+        last_sample = self.spread_sampler.last_sample
+        results = [None, None]
+        pending = []
+        for index, (name, _) in enumerate(sources):
+            cached = self._liquidation_cache.get(name)
+            if cached is not None and self._liquidation_cache_usable(cached, now, last_sample, name + '_mid'):
+                results[index] = cached[0]
+            else:
+                pending.append(index)
+
+        if pending:
+            async with _exchange_slots(*(sources[index][0] for index in pending)):
+                # 先调度全部请求（非awaitable的返回值在此直接报错），再分别限时等待
+                requests = [
+                    asyncio.ensure_future(sources[index][1].get_ticker_position_liquidation_price())
+                    for index in pending
+                ]
+                fetched = await asyncio.gather(
+                    *(asyncio.wait_for(request, timeout=self.liquidation_fetch_timeout) for request in requests),
+                    return_exceptions=True
+                )
+            for index, value in zip(pending, fetched):
+                results[index] = value
+                if not isinstance(value, BaseException):
+                    self._liquidation_cache[sources[index][0]] = (value, now)
+        return results
+
+    def _liquidation_cache_usable(self, cached, now, last_sample, mid_key):
+        """缓存的清算价格是否可用：TTL内直接可用；远离清算线时放宽到liquidation_far_ttl"""
+        liquidation_price, fetched_at = cached
+        age = now - fetched_at
+        if age < self.liquidation_cache_ttl:
+            return True
+        if age >= self.liquidation_far_ttl or last_sample is None or not liquidation_price or liquidation_price <= 0:
+            return False
+        distance_ratio = abs(last_sample[mid_key] - liquidation_price) / liquidation_price
+        return distance_ratio > 2 * self.risk_threshold
+
+    async def _check_liquidation_risk(self, hedge_bot, current_sample, liquidation_results=None):
+        """检查清算风险：当盘口价格接近任意一边清算价格的80%时触发风险控制
+
+        liquidation_results 为调用方已并发获取的清算价格；未提供时在此获取。
+        """
         try:
-            # 并行获取双边清算价格
-            liquidation_results = await asyncio.gather(
-                hedge_bot.primary_client.get_ticker_position_liquidation_price(),
-                hedge_bot.lighter.get_ticker_position_liquidation_price(),
-                return_exceptions=True
-            )
+            if liquidation_results is None:
+                liquidation_results = await self._fetch_liquidation_prices(hedge_bot)
+            elif isinstance(liquidation_results, BaseException):
+                raise liquidation_results
             
             primary_liquidation = liquidation_results[0]
             lighter_liquidation = liquidation_results[1]
@@ -451,7 +747,7 @@ class SmartHedgeStrategy(HedgeStrategy):
             return False
             
         except Exception as e:
-            hedge_bot.logger.error(f"❌ 风险控制检查失败: {e}")
+            hedge_bot.logger.error("❌ 风险控制检查失败: %s", e)
             return False  # 检查失败时保守处理，不触发风险控制
     
     def _check_single_exchange_risk(self, exchange_name, current_price, liquidation_price, logger):
@@ -464,24 +760,22 @@ class SmartHedgeStrategy(HedgeStrategy):
         
         if price_distance_ratio <= self.risk_threshold:
             logger.warning(
-                f"🚨 {exchange_name}清算风险警告: "
-                f"当前价格{current_price:.6f}, 清算价格{liquidation_price:.6f}, "
-                f"距离比例{price_distance_ratio:.2%} <= {self.risk_threshold:.2%}"
+                "🚨 %s清算风险警告: 当前价格%.6f, 清算价格%.6f, 距离比例%.2f%% <= %.2f%%",
+                exchange_name, current_price, liquidation_price, price_distance_ratio * 100, self.risk_threshold * 100
             )
             return True
         else:
             logger.debug(
-                f"✅ {exchange_name}清算风险正常: "
-                f"当前价格{current_price:.6f}, 清算价格{liquidation_price:.6f}, "
-                f"距离比例{price_distance_ratio:.2%}"
+                "✅ %s清算风险正常: 当前价格%.6f, 清算价格%.6f, 距离比例%.2f%%",
+                exchange_name, current_price, liquidation_price, price_distance_ratio * 100
             )
             return False
     
-    def _is_close_timeout(self) -> bool:
+    def _is_close_timeout(self, now=None) -> bool:
         """检查是否超过最大平仓等待时间"""
         if self.close_decision_start_time is None:
             return False
-        elapsed_minutes = (time.time() - self.close_decision_start_time) / 60
+        elapsed_minutes = ((time.monotonic() if now is None else now) - self.close_decision_start_time) / 60
         return elapsed_minutes >= self.max_close_wait_minutes
     
     def _reset_close_decision_time(self):
@@ -51,6 +51,8 @@ class LighterProxy:
         self.lighter_order_book_sequence_gap = False
         self.lighter_snapshot_loaded = False
         self.lighter_order_book_lock = asyncio.Lock()
+        # 最优买卖价变化时置位，供策略轮询提前醒来
+        self.bbo_changed = asyncio.Event()
 
         # Lighter WebSocket state
         self.lighter_order_result = None
@@ -375,10 +377,13 @@ class LighterProxy:
                                     best_bid, best_ask = self.get_lighter_best_levels()
 
                                     # Update global variables
+                                    previous_bbo = (self.lighter_best_bid, self.lighter_best_ask)
                                     if best_bid is not None:
                                         self.lighter_best_bid = best_bid[0]
                                     if best_ask is not None:
                                         self.lighter_best_ask = best_ask[0]
+                                    if (self.lighter_best_bid, self.lighter_best_ask) != previous_bbo:
+                                        self.bbo_changed.set()
 
                                 elif data.get("type") == "ping":
                                     # Respond to ping with pong
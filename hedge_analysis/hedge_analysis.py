@@ -8,8 +8,9 @@ Key Updates:
 - Hedge matching: Positions within 5 minutes across DEXs = hedge pair
 """
 
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Optional
 import sys
@@ -18,6 +19,7 @@ import sys
 POSITION_AGGREGATION_MINUTES = 2  # Orders within 2 min = same position (both DEXs)
 HEDGE_MATCHING_MINUTES = 30       # Positions within 30 min = hedge pair (手动操作)
 LIGHTER_DATE_FILTER = datetime(2025, 10, 18)  # Filter Lighter records from this date
+EDGEX_TIMEZONE = 'Asia/Shanghai'  # Edgex exports are in UTC+8
 
 
 @dataclass
@@ -67,18 +69,16 @@ def parse_lighter_csv(filepath: str) -> pd.DataFrame:
     Filters records from Oct 18, 2025 onwards
     """
     print(f"📖 Reading Lighter CSV: {filepath}")
-    df = pd.read_csv(filepath)
-
-    # Convert date column to datetime (already UTC)
-    df['Date'] = pd.to_datetime(df['Date'])
+    # Date column parsed to datetime while reading (already UTC)
+    df = pd.read_csv(filepath, parse_dates=['Date'])
 
     # Filter from Oct 18 onwards
     df = df[df['Date'] >= LIGHTER_DATE_FILTER].copy()
 
-    # Convert numeric columns to float
+    # Coerce numeric columns the CSV parser could not type (e.g. stray text cells)
     numeric_cols = ['Trade Value', 'Size', 'Price', 'Closed PnL', 'Fee']
     for col in numeric_cols:
-        if col in df.columns:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
             df[col] = pd.to_numeric(df[col], errors='coerce')
 
     print(f"   ✓ Loaded {len(df)} records (UTC timezone)")
@@ -91,7 +91,8 @@ def parse_edgex_csv(filepath: str) -> pd.DataFrame:
     IMPORTANT: Converts UTC+8 to UTC timezone
     """
     print(f"📖 Reading Edgex CSV: {filepath}")
-    df = pd.read_csv(filepath)
+    # thousands=',' lets the parser read comma-grouped and '+'-signed amounts as floats directly
+    df = pd.read_csv(filepath, thousands=',')
 
     # Map Chinese headers to English
     column_mapping = {
@@ -110,18 +111,24 @@ def parse_edgex_csv(filepath: str) -> pd.DataFrame:
 
     df = df.rename(columns=column_mapping)
 
-    # Clean Quantity column (remove any crypto symbol suffix)
-    df['Quantity'] = df['Quantity'].astype(str).str.replace(r'\s+[A-Z]+$', '', regex=True).str.replace(',', '').astype(float)
+    # Characters stripped from text amounts in one str.translate pass
+    strip_chars = str.maketrans('', '', ',+')
+
+    # Clean Quantity column (drop the crypto symbol suffix, e.g. "1,234.5 ETH")
+    df['Quantity'] = df['Quantity'].astype(str).str.split().str[0].str.translate(strip_chars).astype(float)
 
-    # Clean numeric columns (remove commas and convert)
+    # Clean numeric columns the parser left as text (remove commas and convert)
     numeric_cols = ['EntryPrice', 'ExitPrice', 'ClosedPnL', 'OpenFee', 'CloseFee', 'FundingFee']
     for col in numeric_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.replace(',', '').str.replace('+', '').astype(float)
+        if col not in df.columns:
+            continue
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(str).str.translate(strip_chars)
+        df[col] = df[col].astype(float)
 
-    # Convert date from UTC+8 to UTC
-    df['OrderTime'] = pd.to_datetime(df['OrderTime'])
-    df['OrderTime_UTC'] = df['OrderTime'] - timedelta(hours=8)
+    # Convert date from UTC+8 to UTC (OrderTime keeps its Asia/Shanghai zone, OrderTime_UTC is naive UTC)
+    df['OrderTime'] = pd.to_datetime(df['OrderTime']).dt.tz_localize(EDGEX_TIMEZONE)
+    df['OrderTime_UTC'] = df['OrderTime'].dt.tz_convert('UTC').dt.tz_localize(None)
 
     print(f"   ✓ Loaded {len(df)} records (converted UTC+8 → UTC)")
     return df
@@ -131,65 +138,74 @@ def aggregate_lighter_orders(df: pd.DataFrame) -> List[Position]:
     """
     Aggregate Lighter orders into complete positions
     Orders within 2 minutes on same asset/direction = 1 position
+    Windows are located with np.searchsorted on the sorted order times
     """
     print("\n🔧 Aggregating Lighter orders into positions (2-min window)...")
     positions = []
+    window = np.timedelta64(POSITION_AGGREGATION_MINUTES, 'm')
+    lookahead = np.timedelta64(24, 'h')
 
-    for market in df['Market'].unique():
-        market_df = df[df['Market'] == market].copy()
-        market_df = market_df.sort_values('Date')
+    # Sort once and split by (market, side) in a single pass
+    orders = df.sort_values('Date', kind='stable')
+    orders_by_side = dict(tuple(orders.groupby(['Market', 'Side'], sort=False)))
+    no_orders = orders.iloc[0:0]
 
+    for market in df['Market'].unique():
         # Process both Long and Short positions
         for direction in ['Long', 'Short']:
             # Get all open and close orders
-            open_orders = market_df[market_df['Side'] == f'Open {direction}'].copy()
-            close_orders = market_df[market_df['Side'] == f'Close {direction}'].copy()
-
-            # Group open orders by 2-minute time windows
-            processed_open_indices = set()
-            processed_close_indices = set()
-
-            for idx, anchor_open in open_orders.iterrows():
-                if idx in processed_open_indices:
+            open_orders = orders_by_side.get((market, f'Open {direction}'), no_orders)
+            close_orders = orders_by_side.get((market, f'Close {direction}'), no_orders)
+
+            # Sorted order times as arrays
+            open_times = open_orders['Date'].to_numpy(dtype='datetime64[ns]')
+            close_times = close_orders['Date'].to_numpy(dtype='datetime64[ns]')
+            open_size = open_orders['Size'].to_numpy(dtype=float)
+            open_value = open_orders['Price'].to_numpy(dtype=float) * open_size
+            open_fee = open_orders['Fee'].to_numpy(dtype=float)
+            close_size = close_orders['Size'].to_numpy(dtype=float)
+            close_value = close_orders['Price'].to_numpy(dtype=float) * close_size
+            close_fee = close_orders['Fee'].to_numpy(dtype=float)
+            close_pnl = close_orders['Closed PnL'].to_numpy(dtype=float)
+
+            # Window bounds for every anchor: opens within 2 minutes, closes up to 24 hours ahead
+            open_lo = np.searchsorted(open_times, open_times - window, side='left')
+            open_hi = np.searchsorted(open_times, open_times + window, side='right')
+            close_lo = np.searchsorted(close_times, open_times, side='left')
+            close_hi = np.searchsorted(close_times, open_times + lookahead, side='right')
+
+            processed_open = np.zeros(len(open_times), dtype=bool)
+            processed_close = np.zeros(len(close_times), dtype=bool)
+
+            for i in range(len(open_times)):
+                if processed_open[i]:
                     continue
 
-                anchor_time = anchor_open['Date']
-
-                # Find all opens within 2 minutes
-                window_opens = open_orders[
-                    (open_orders['Date'] >= anchor_time - timedelta(minutes=POSITION_AGGREGATION_MINUTES)) &
-                    (open_orders['Date'] <= anchor_time + timedelta(minutes=POSITION_AGGREGATION_MINUTES)) &
-                    (~open_orders.index.isin(processed_open_indices))
-                ]
-
                 # Find matching closes (look ahead up to 24 hours)
-                window_closes = close_orders[
-                    (close_orders['Date'] >= anchor_time) &
-                    (close_orders['Date'] <= anchor_time + timedelta(hours=24)) &
-                    (~close_orders.index.isin(processed_close_indices))
-                ]
+                window_closes = close_lo[i] + np.flatnonzero(~processed_close[close_lo[i]:close_hi[i]])
 
                 if len(window_closes) == 0:
                     continue  # Skip if no closes found
 
                 # Group closes within 2 minutes of first close
-                first_close_time = window_closes['Date'].min()
-                final_closes = window_closes[
-                    (window_closes['Date'] >= first_close_time - timedelta(minutes=POSITION_AGGREGATION_MINUTES)) &
-                    (window_closes['Date'] <= first_close_time + timedelta(minutes=POSITION_AGGREGATION_MINUTES))
-                ]
+                first_close_time = close_times[window_closes[0]]
+                final_hi = np.searchsorted(close_times, first_close_time + window, side='right')
+                final_closes = window_closes[window_closes < final_hi]
+
+                # Find all opens within 2 minutes
+                window_opens = open_lo[i] + np.flatnonzero(~processed_open[open_lo[i]:open_hi[i]])
 
                 # Calculate aggregated position metrics
-                total_open_size = window_opens['Size'].sum()
-                total_close_size = final_closes['Size'].sum()
+                total_open_size = np.nansum(open_size[window_opens])
+                total_close_size = np.nansum(close_size[final_closes])
 
                 # Weighted average prices
-                avg_entry = (window_opens['Price'] * window_opens['Size']).sum() / total_open_size if total_open_size > 0 else 0
-                avg_exit = (final_closes['Price'] * final_closes['Size']).sum() / total_close_size if total_close_size > 0 else 0
+                avg_entry = np.nansum(open_value[window_opens]) / total_open_size if total_open_size > 0 else 0
+                avg_exit = np.nansum(close_value[final_closes]) / total_close_size if total_close_size > 0 else 0
 
                 # Total PnL and fees
-                total_pnl = final_closes['Closed PnL'].sum()
-                total_fees = window_opens['Fee'].sum() + final_closes['Fee'].sum()
+                total_pnl = np.nansum(close_pnl[final_closes])
+                total_fees = np.nansum(open_fee[window_opens]) + np.nansum(close_fee[final_closes])
 
                 position = Position(
                     dex='Lighter',
@@ -200,15 +216,15 @@ def aggregate_lighter_orders(df: pd.DataFrame) -> List[Position]:
                     exit_price=avg_exit,
                     pnl=total_pnl,
                     total_fees=total_fees,
-                    open_time=window_opens['Date'].min(),
-                    close_time=final_closes['Date'].max()
+                    open_time=open_orders['Date'].iloc[window_opens[0]],
+                    close_time=close_orders['Date'].iloc[final_closes[-1]]
                 )
 
                 positions.append(position)
 
                 # Mark as processed
-                processed_open_indices.update(window_opens.index)
-                processed_close_indices.update(final_closes.index)
+                processed_open[window_opens] = True
+                processed_close[final_closes] = True
 
     print(f"   ✓ Aggregated into {len(positions)} Lighter positions")
     return positions
@@ -227,62 +243,63 @@ def aggregate_by_entry_price(records: List[dict], time_limit: int = 60) -> List[
     Returns:
         聚合后的记录列表
     """
-    # 按（币种、方向、入场价格）分组
-    groups = {}
-
-    for record in records:
-        # 使用入场价格作为分组键（保留2位小数以处理浮点误差）
-        entry_price_key = round(record['entry_price'], 2)
-        key = (record['asset'], record['direction'], entry_price_key)
+    if not records:
+        return []
 
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(record)
+    # 按（币种、方向、入场价格）分组
+    # 使用入场价格作为分组键（保留2位小数以处理浮点误差）
+    df = pd.DataFrame(records)
+    df['entry_price_key'] = df['entry_price'].round(2)
+    df['exit_value'] = df['exit_price'] * df['size']
+    groups = df.groupby(['asset', 'direction', 'entry_price_key'], sort=False, dropna=False)
+
+    summary = groups.agg(
+        count=('size', 'size'),
+        size=('size', 'sum'),
+        pnl=('pnl', 'sum'),
+        open_fee=('open_fee', 'sum'),
+        close_fee=('close_fee', 'sum'),
+        funding_fee=('funding_fee', 'sum'),
+        exit_value=('exit_value', 'sum'),
+        first_time=('close_time', 'min'),
+        last_time=('close_time', 'max'),
+    )
+    summary['time_span'] = (summary['last_time'] - summary['first_time']).dt.total_seconds() / 60
+
+    # 各组的原始记录（组号与 summary 行顺序一致）
+    members = [[] for _ in range(len(summary))]
+    for record, group_no in zip(records, groups.ngroup()):
+        members[group_no].append(record)
 
     aggregated = []
     price_groups_found = 0
 
-    for key, group in groups.items():
-        if len(group) == 1:
-            # 单个订单直接返回
-            aggregated.append(group[0])
-        else:
-            # 检查时间跨度
-            times = [r['close_time'] for r in group]
-            time_span = (max(times) - min(times)).total_seconds() / 60
-
-            if time_span <= time_limit:
-                # 聚合分批订单
-                price_groups_found += 1
-                total_size = sum(r['size'] for r in group)
-                total_pnl = sum(r['pnl'] for r in group)
-                total_open_fee = sum(r['open_fee'] for r in group)
-                total_close_fee = sum(r['close_fee'] for r in group)
-                total_funding_fee = sum(r['funding_fee'] for r in group)
-
-                # 加权平均出场价格
-                weighted_exit = sum(r['exit_price'] * r['size'] for r in group) / total_size
-
-                aggregated_record = {
-                    'asset': key[0],
-                    'direction': key[1],
-                    'entry_price': key[2],  # 相同的入场价
-                    'size': total_size,
-                    'exit_price': weighted_exit,
-                    'pnl': total_pnl,
-                    'open_fee': total_open_fee,
-                    'close_fee': total_close_fee,
-                    'funding_fee': total_funding_fee,
-                    'close_time': min(times)  # 使用最早时间
-                }
-
-                print(f"  🔗 价格聚合: {key[0]} {key[1]} @ ${key[2]:.2f}")
-                print(f"     {len(group)}笔分批 跨度{time_span:.1f}分钟 总计{total_size:.4f}")
-
-                aggregated.append(aggregated_record)
-            else:
-                # 时间跨度太大，不聚合
-                aggregated.extend(group)
+    for key, row, group in zip(summary.index, summary.itertuples(index=False), members):
+        if row.count == 1 or row.time_span > time_limit:
+            # 单个订单直接返回；时间跨度太大，不聚合
+            aggregated.extend(group)
+            continue
+
+        # 聚合分批订单
+        price_groups_found += 1
+
+        aggregated_record = {
+            'asset': key[0],
+            'direction': key[1],
+            'entry_price': key[2],  # 相同的入场价
+            'size': row.size,
+            'exit_price': row.exit_value / row.size,  # 加权平均出场价格
+            'pnl': row.pnl,
+            'open_fee': row.open_fee,
+            'close_fee': row.close_fee,
+            'funding_fee': row.funding_fee,
+            'close_time': row.first_time  # 使用最早时间
+        }
+
+        print(f"  🔗 价格聚合: {key[0]} {key[1]} @ ${key[2]:.2f}")
+        print(f"     {row.count}笔分批 跨度{row.time_span:.1f}分钟 总计{row.size:.4f}")
+
+        aggregated.append(aggregated_record)
 
     if price_groups_found > 0:
         print(f"   ✓ 价格聚合: 发现 {price_groups_found} 组分批平仓")
@@ -290,6 +307,35 @@ def aggregate_by_entry_price(records: List[dict], time_limit: int = 60) -> List[
     return aggregated
 
 
+def merge_edgex_group(group: List[dict]) -> Position:
+    """
+    Merge Edgex records of one asset/direction, sorted by close time, into a Position
+    """
+    total_size = total_pnl = total_fees = entry_value = exit_value = 0
+    for record in group:
+        total_size += record['size']
+        total_pnl += record['pnl']
+        total_fees += record['open_fee'] + record['close_fee'] + record['funding_fee']
+        entry_value += record['entry_price'] * record['size']
+        exit_value += record['exit_price'] * record['size']
+
+    # Use earliest close time
+    earliest_close = group[0]['close_time']
+
+    return Position(
+        dex='Edgex',
+        asset=group[0]['asset'],
+        direction=group[0]['direction'],
+        size=total_size,
+        entry_price=entry_value / total_size,
+        exit_price=exit_value / total_size,
+        pnl=total_pnl,
+        total_fees=total_fees,
+        open_time=earliest_close,  # This is actually close time
+        close_time=earliest_close
+    )
+
+
 def convert_edgex_to_positions(df: pd.DataFrame) -> List[Position]:
     """
     Convert Edgex aggregated position data to Position objects
@@ -299,35 +345,48 @@ def convert_edgex_to_positions(df: pd.DataFrame) -> List[Position]:
     print("\n🔧 Converting and aggregating Edgex positions...")
 
     # STEP 1: Pre-aggregate orders at the exact same second (fixes Match #14 issue)
-    df['time_second'] = df['OrderTime_UTC'].dt.floor('S')  # Round to nearest second
+    df['time_second'] = df['OrderTime_UTC'].dt.floor('s')  # Round down to the second
 
-    # Extract asset
-    df['asset'] = df['Contract'].str.replace('USDT永续', '').str.replace('USDT', '').str.replace('USD', '')
+    # Extract asset (few distinct contracts: strip each once and map)
+    assets = {contract: contract.replace('USDT永续', '').replace('USDT', '').replace('USD', '')
+              for contract in df['Contract'].dropna().unique()}
+    df['asset'] = df['Contract'].map(assets)
 
     # Infer direction from close action
-    df['direction'] = df['Type'].apply(lambda x: 'Short' if x == '买入' else 'Long')
+    df['direction'] = np.where(df['Type'] == '买入', 'Short', 'Long')
+
+    # Aggregate all orders at each exact second in one groupby pass
+    df['entry_value'] = df['EntryPrice'] * df['Quantity']
+    df['exit_value'] = df['ExitPrice'] * df['Quantity']
+    seconds = df.groupby(['asset', 'direction', 'time_second']).agg(
+        count=('Quantity', 'size'),
+        size=('Quantity', 'sum'),
+        entry_value=('entry_value', 'sum'),
+        exit_value=('exit_value', 'sum'),
+        pnl=('ClosedPnL', 'sum'),
+        open_fee=('OpenFee', 'sum'),
+        close_fee=('CloseFee', 'sum'),
+        funding_fee=('FundingFee', 'sum'),
+    )
 
     pre_aggregated = []
     same_second_groups = 0
 
-    for (asset, direction, time_sec), group in df.groupby(['asset', 'direction', 'time_second']):
-        if len(group) > 1:
+    for (asset, direction, time_sec), row in zip(seconds.index, seconds.itertuples(index=False)):
+        if row.count > 1:
             same_second_groups += 1
-            print(f"  🔗 聚合同秒订单: {asset} {direction} @ {time_sec.strftime('%H:%M:%S')} ({len(group)}条)")
-
-        # Aggregate all orders at this exact second
-        total_qty = group['Quantity'].sum()
+            print(f"  🔗 聚合同秒订单: {asset} {direction} @ {time_sec.strftime('%H:%M:%S')} ({row.count}条)")
 
         record = {
             'asset': asset,
             'direction': direction,
-            'size': total_qty,
-            'entry_price': (group['EntryPrice'] * group['Quantity']).sum() / total_qty,
-            'exit_price': (group['ExitPrice'] * group['Quantity']).sum() / total_qty,
-            'pnl': group['ClosedPnL'].sum(),
-            'open_fee': group['OpenFee'].sum(),
-            'close_fee': group['CloseFee'].sum(),
-            'funding_fee': group['FundingFee'].sum(),
+            'size': row.size,
+            'entry_price': row.entry_value / row.size,
+            'exit_price': row.exit_value / row.size,
+            'pnl': row.pnl,
+            'open_fee': row.open_fee,
+            'close_fee': row.close_fee,
+            'funding_fee': row.funding_fee,
             'close_time': time_sec
         }
         pre_aggregated.append(record)
@@ -339,124 +398,157 @@ def convert_edgex_to_positions(df: pd.DataFrame) -> List[Position]:
     pre_aggregated = aggregate_by_entry_price(pre_aggregated, time_limit=60)
 
     # STEP 3: Time-window aggregation (2-minute window)
+    # Sorted by (asset, direction, close_time): one sweep, new group when the key changes
+    # or the record is more than 2 minutes after the group's first close
+    rows = sorted(pre_aggregated, key=lambda r: (r['asset'], r['direction'], r['close_time']))
+    window_seconds = POSITION_AGGREGATION_MINUTES * 60
     positions = []
-    processed_indices = set()
-
-    for i, anchor in enumerate(pre_aggregated):
-        if i in processed_indices:
-            continue
-
-        anchor_time = anchor['close_time']
+    group = []
 
-        # Find all positions within 2 minutes with same asset and direction
-        group_indices = []
-        for j, pos in enumerate(pre_aggregated):
-            if j in processed_indices:
-                continue
+    for row in rows:
+        if group and ((row['asset'], row['direction']) != (group[0]['asset'], group[0]['direction']) or
+                      (row['close_time'] - group[0]['close_time']).total_seconds() > window_seconds):
+            positions.append(merge_edgex_group(group))
+            group = []
+        group.append(row)
 
-            if (pos['asset'] == anchor['asset'] and
-                pos['direction'] == anchor['direction'] and
-                abs((pos['close_time'] - anchor_time).total_seconds()) <= POSITION_AGGREGATION_MINUTES * 60):
-                group_indices.append(j)
-
-        # Aggregate the group
-        if group_indices:
-            total_size = sum(pre_aggregated[idx]['size'] for idx in group_indices)
-            total_pnl = sum(pre_aggregated[idx]['pnl'] for idx in group_indices)
-            total_open_fee = sum(pre_aggregated[idx]['open_fee'] for idx in group_indices)
-            total_close_fee = sum(pre_aggregated[idx]['close_fee'] for idx in group_indices)
-            total_funding_fee = sum(pre_aggregated[idx]['funding_fee'] for idx in group_indices)
-
-            # Weighted average prices
-            weighted_entry = sum(pre_aggregated[idx]['entry_price'] * pre_aggregated[idx]['size']
-                                for idx in group_indices) / total_size
-            weighted_exit = sum(pre_aggregated[idx]['exit_price'] * pre_aggregated[idx]['size']
-                               for idx in group_indices) / total_size
-
-            # Use earliest close time
-            earliest_close = min(pre_aggregated[idx]['close_time'] for idx in group_indices)
-
-            position = Position(
-                dex='Edgex',
-                asset=anchor['asset'],
-                direction=anchor['direction'],
-                size=total_size,
-                entry_price=weighted_entry,
-                exit_price=weighted_exit,
-                pnl=total_pnl,
-                total_fees=total_open_fee + total_close_fee + total_funding_fee,
-                open_time=earliest_close,  # This is actually close time
-                close_time=earliest_close
-            )
-
-            positions.append(position)
-            processed_indices.update(group_indices)
+    if group:
+        positions.append(merge_edgex_group(group))
 
     print(f"   ✓ 最终聚合: {len(pre_aggregated)} 个同秒仓位 → {len(positions)} 个Edgex仓位")
     return positions
 
 
+def _augment_match(root: int, candidates: List[List[int]], pair_lighter: List[int], pair_edgex: List[int],
+                   lighter_pair: List[int], edgex_owner: List[int], visited: List[bool]) -> bool:
+    """
+    Search for an augmenting path from the unmatched Lighter position root (iterative DFS)
+    On success, flip the pairs along the path so that root is matched as well
+    """
+    stack = [(root, iter(candidates[root]))]
+    path = []  # pair leading into each stack entry after the root
+    while stack:
+        for pair in stack[-1][1]:
+            edgex_idx = pair_edgex[pair]
+            if visited[edgex_idx]:
+                continue
+            visited[edgex_idx] = True
+            path.append(pair)
+            owner = edgex_owner[edgex_idx]
+            if owner < 0:
+                for path_pair in path:
+                    lighter_pair[pair_lighter[path_pair]] = path_pair
+                    edgex_owner[pair_edgex[path_pair]] = pair_lighter[path_pair]
+                return True
+            stack.append((owner, iter(candidates[owner])))
+            break
+        else:
+            stack.pop()
+            if path:
+                path.pop()
+    return False
+
+
 def match_positions(lighter_positions: List[Position],
                    edgex_positions: List[Position]) -> tuple[List[MatchedHedge], List[Position], List[Position]]:
     """
     Match hedged positions between Lighter and Edgex
     Criteria: same asset, opposite directions, close times within 30 minutes
+    Pairs are taken globally by lowest score, so an early Lighter position cannot
+    take an Edgex position that is a much better match for a later one; augmenting
+    paths then re-pair positions so that no hedge pair is lost to that preference
     NOTE: Edgex CSV only has close time, not open time!
     Returns: (matches, unmatched_lighter, unmatched_edgex)
     """
     print(f"\n🔗 Matching hedge pairs (30-min close time window, opposite directions)...")
     matches = []
-    matched_lighter_indices = set()
-    matched_edgex_indices = set()
-
+    matched_lighter = np.zeros(len(lighter_positions), dtype=bool)
+    matched_edgex = np.zeros(len(edgex_positions), dtype=bool)
+    window = np.timedelta64(HEDGE_MATCHING_MINUTES, 'm')
+
+    # Edgex candidates per asset, sorted by close time (Edgex open_time is actually close time)
+    edgex_by_asset = {}
+    for idx, edgex_pos in enumerate(edgex_positions):
+        edgex_by_asset.setdefault(edgex_pos.asset, []).append(idx)
+
+    books = {}
+    for asset, indices in edgex_by_asset.items():
+        times = pd.DatetimeIndex([edgex_positions[idx].open_time for idx in indices]).to_numpy()
+        order = np.argsort(times, kind='stable')
+        books[asset] = (
+            np.array(indices)[order],
+            times[order],
+            np.array([edgex_positions[idx].size for idx in indices], dtype=float)[order],
+            np.array([edgex_positions[idx].direction for idx in indices], dtype=object)[order],
+        )
+
+    # Score every candidate pair inside the 30-minute close time window
+    pair_lighter, pair_edgex, pair_score, pair_time_diff = [], [], [], []
     for lighter_idx, lighter_pos in enumerate(lighter_positions):
-        best_match = None
-        best_score = float('inf')
-        best_idx = None
-
-        for idx, edgex_pos in enumerate(edgex_positions):
-            if idx in matched_edgex_indices:
-                continue
+        # Must be same asset, with a close time to compare against
+        if lighter_pos.asset not in books or lighter_pos.close_time is None:
+            continue
 
-            # Must be same asset
-            if lighter_pos.asset != edgex_pos.asset:
-                continue
+        indices, times, sizes, directions = books[lighter_pos.asset]
+        close_time = np.datetime64(pd.Timestamp(lighter_pos.close_time), 'ns')
 
-            # Must be opposite directions (hedge)
-            if lighter_pos.direction == edgex_pos.direction:
-                continue
+        lo = np.searchsorted(times, close_time - window, side='left')
+        hi = np.searchsorted(times, close_time + window, side='right')
+        time_diff = np.abs((times[lo:hi] - close_time) / np.timedelta64(1, 's')) / 60
 
-            # Check close time proximity (5 minutes)
-            # Edgex open_time is actually close time (CSV limitation)
-            if lighter_pos.close_time is None:
-                continue
+        # Must be opposite directions (hedge)
+        available = (directions[lo:hi] != lighter_pos.direction) & (time_diff <= HEDGE_MATCHING_MINUTES)
+        if not available.any():
+            continue
 
-            time_diff = abs((lighter_pos.close_time - edgex_pos.open_time).total_seconds() / 60)
-            if time_diff > HEDGE_MATCHING_MINUTES:
+        # Calculate match score (prefer closer time match and size)
+        candidate_sizes = sizes[lo:hi][available]
+        size_diff_pct = np.abs(lighter_pos.size - candidate_sizes) / np.maximum(lighter_pos.size, candidate_sizes) * 100
+        pair_lighter.append(np.full(len(candidate_sizes), lighter_idx))
+        pair_edgex.append(indices[lo:hi][available])
+        pair_score.append(time_diff[available] + (size_diff_pct * 0.01))  # Heavily prioritize time match
+        pair_time_diff.append(time_diff[available])
+
+    if pair_score:
+        pair_lighter = np.concatenate(pair_lighter).tolist()
+        pair_edgex = np.concatenate(pair_edgex).tolist()
+        pair_score = np.concatenate(pair_score)
+        pair_time_diff = np.concatenate(pair_time_diff)
+
+        # Globally greedy: accept pairs from the lowest score up while both sides are still free
+        lighter_pair = [-1] * len(lighter_positions)  # Lighter index -> accepted pair
+        edgex_owner = [-1] * len(edgex_positions)  # Edgex index -> matched Lighter index
+        candidates = [[] for _ in lighter_positions]  # Lighter index -> pairs, lowest score first
+        for pair in np.lexsort((pair_edgex, pair_lighter, pair_score)).tolist():
+            lighter_idx, edgex_idx = pair_lighter[pair], pair_edgex[pair]
+            candidates[lighter_idx].append(pair)
+            if lighter_pair[lighter_idx] < 0 and edgex_owner[edgex_idx] < 0:
+                lighter_pair[lighter_idx] = pair
+                edgex_owner[edgex_idx] = lighter_idx
+
+        # Maximum cardinality: grow the matching along augmenting paths, trying lower scores first
+        visited = [False] * len(edgex_positions)
+        for lighter_idx, candidate_pairs in enumerate(candidates):
+            if lighter_pair[lighter_idx] < 0 and candidate_pairs and _augment_match(
+                    lighter_idx, candidates, pair_lighter, pair_edgex, lighter_pair, edgex_owner, visited):
+                # A failed search leaves its visited Edgex positions unreachable until the matching changes
+                visited = [False] * len(edgex_positions)
+
+        # Report in Lighter position order
+        for lighter_idx, pair in enumerate(lighter_pair):
+            if pair < 0:
                 continue
-
-            # Calculate match score (prefer closer time match and size)
-            size_diff_pct = abs(lighter_pos.size - edgex_pos.size) / max(lighter_pos.size, edgex_pos.size) * 100
-            score = time_diff + (size_diff_pct * 0.01)  # Heavily prioritize time match
-
-            if score < best_score:
-                best_score = score
-                best_match = edgex_pos
-                best_idx = idx
-                best_time_diff = time_diff
-
-        if best_match:
+            matched_lighter[lighter_idx] = True
+            matched_edgex[pair_edgex[pair]] = True
             matches.append(MatchedHedge(
-                lighter_pos=lighter_pos,
-                edgex_pos=best_match,
-                time_diff_minutes=best_time_diff
+                lighter_pos=lighter_positions[lighter_idx],
+                edgex_pos=edgex_positions[pair_edgex[pair]],
+                time_diff_minutes=float(pair_time_diff[pair])
             ))
-            matched_lighter_indices.add(lighter_idx)
-            matched_edgex_indices.add(best_idx)
 
     # Collect unmatched positions
-    unmatched_lighter = [pos for idx, pos in enumerate(lighter_positions) if idx not in matched_lighter_indices]
-    unmatched_edgex = [pos for idx, pos in enumerate(edgex_positions) if idx not in matched_edgex_indices]
+    unmatched_lighter = [pos for idx, pos in enumerate(lighter_positions) if not matched_lighter[idx]]
+    unmatched_edgex = [pos for idx, pos in enumerate(edgex_positions) if not matched_edgex[idx]]
 
     print(f"   ✓ Matched {len(matches)} hedge pairs")
     print(f"   ⚠ Unmatched: {len(unmatched_lighter)} Lighter, {len(unmatched_edgex)} Edgex")
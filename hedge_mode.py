@@ -27,6 +27,9 @@ from decimal import Decimal
 from pathlib import Path
 import dotenv
 
+from helpers.loop_monitor import enable_slow_callback_warnings, monitor_loop_lag
+
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -54,6 +57,8 @@ Examples:
                         help='Timeout in seconds for maker order fills (default: 5)')
     parser.add_argument('--env-file', type=str, default=".env",
                         help=".env file path (default: .env)")
+    parser.add_argument('--asyncio-debug', action='store_true',
+                        help='Log every event loop callback that blocks longer than 100ms (adds overhead)')
     
     return parser.parse_args()
 
@@ -116,6 +121,10 @@ async def main():
     print(f"Ticker: {args.ticker}, Size: {args.size}, Iterations: {args.iter}")
     print("-" * 50)
     
+    if args.asyncio_debug:
+        enable_slow_callback_warnings()
+    lag_monitor = None
+
     try:
         # Create the hedge bot instance
         bot = HedgeBotClass(
@@ -124,6 +133,9 @@ async def main():
             fill_timeout=args.fill_timeout,
             iterations=args.iter
         )
+        # Always-on, low-overhead detector for blocking calls in the polling loops; it logs through the
+        # bot's logger because the bot silences every other logger once it is built
+        lag_monitor = asyncio.create_task(monitor_loop_lag(log=bot.logger))
         
         # Run the bot
         await bot.run()
@@ -136,6 +148,9 @@ async def main():
         import traceback
         print(f"Full traceback: {traceback.format_exc()}")
         return 1
+    finally:
+        if lag_monitor is not None:
+            lag_monitor.cancel()
     
     return 0
 
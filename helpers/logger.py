@@ -4,30 +4,62 @@ Trading logger with structured output and error handling.
 
 import os
 import csv
+import atexit
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 import pytz
 from decimal import Decimal
+from typing import Any, Dict, TextIO, Tuple
+
+_utcnow = datetime.now
+_UTC = timezone.utc
+
+_TRADE_CSV_HEADER = ['exchange', 'timestamp', 'side', 'price', 'quantity']
+
+# filename -> (file handle, csv writer), opened lazily and kept for the process lifetime
+_WRITERS: Dict[str, Tuple[TextIO, Any]] = {}
+
+
+def _get_writer(filename: str):
+    """Return a persistent (file, csv writer) pair for filename, writing the header for new files."""
+    entry = _WRITERS.get(filename)
+    if entry is None:
+        csvfile = open(filename, 'a', newline='')
+        writer = csv.writer(csvfile)
+        # append mode starts at end of file, so position 0 means a new/empty file
+        if csvfile.tell() == 0:
+            writer.writerow(_TRADE_CSV_HEADER)
+        entry = _WRITERS[filename] = (csvfile, writer)
+    return entry
+
+
+@atexit.register
+def _close_writers():
+    """Close all persistent trade CSV handles."""
+    for csvfile, _ in _WRITERS.values():
+        try:
+            csvfile.close()
+        except Exception:
+            pass
+    _WRITERS.clear()
+
+
+def trade_csv_row(exchange: str, side: str, price: str, quantity: str) -> list:
+    """Build a trade CSV row stamped with the current UTC time."""
+    return [exchange, _utcnow(_UTC).isoformat(), side, price, quantity]
+
+
+def write_trade_rows(exchange: str, ticker: str, rows: list):
+    """Append trade rows to the exchange/ticker trade CSV with a single flush."""
+    csvfile, writer = _get_writer(f"logs/{exchange}_{ticker}_hedge_mode_trades.csv")
+    writer.writerows(rows)
+    csvfile.flush()
+
 
 def log_trade_to_csv(exchange: str, ticker: str, side: str, price: str, quantity: str):
     """Log trade details to CSV file."""
-    timestamp = datetime.now(pytz.UTC).isoformat()
-    filename = f"logs/{exchange}_{ticker}_hedge_mode_trades.csv"
-    """Initialize CSV file with headers if it doesn't exist."""
-    if not os.path.exists(filename):
-        with open(filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['exchange', 'timestamp', 'side', 'price', 'quantity'])
-
-    with open(filename, 'a', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([
-            exchange,
-            timestamp,
-            side,
-            price,
-            quantity
-        ])
+    write_trade_rows(exchange, ticker, [trade_csv_row(exchange, side, price, quantity)])
+
 
 class TradingLogger:
     """Enhanced logging with structured output and error handling."""
@@ -35,9 +67,9 @@ class TradingLogger:
     def __init__(self, exchange: str, ticker: str, log_to_console: bool = False):
         self.exchange = exchange
         self.ticker = ticker
-        # Ensure logs directory exists at the project root
+        # Ensure logs directory exists (LOG_DIR, defaulting to logs/ at the project root)
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-        logs_dir = os.path.join(project_root, 'logs')
+        logs_dir = os.getenv('LOG_DIR') or os.path.join(project_root, 'logs')
         os.makedirs(logs_dir, exist_ok=True)
 
         order_file_name = f"{exchange}_{ticker}_orders.csv"
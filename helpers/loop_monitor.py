@@ -0,0 +1,39 @@
+"""
+Event loop responsiveness monitoring.
+
+A synchronous call (time.sleep, blocking HTTP) inside a coroutine stalls every
+other task on the loop. These helpers make such stalls visible in the logs.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+SLOW_CALLBACK_DURATION = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+def enable_slow_callback_warnings(loop: Optional[asyncio.AbstractEventLoop] = None,
+                                  threshold: float = SLOW_CALLBACK_DURATION) -> None:
+    """Enable asyncio debug mode so any callback running longer than threshold is logged."""
+    loop = loop or asyncio.get_running_loop()
+    loop.set_debug(True)
+    loop.slow_callback_duration = threshold
+    logging.getLogger('asyncio').setLevel(logging.WARNING)
+
+
+async def monitor_loop_lag(interval: float = 1.0, threshold: float = 0.5,
+                           log: Optional[logging.Logger] = None) -> None:
+    """Warn whenever the loop wakes up more than threshold seconds late.
+
+    Cheap enough to run in production, unlike asyncio debug mode.
+    """
+    log = log or logger
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        lag = time.monotonic() - start - interval
+        if lag > threshold:
+            log.warning("Event loop blocked for %.3fs - synchronous call in async code?", lag)
@@ -1,7 +1,8 @@
 import os
 import ssl
+import aiohttp
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import certifi
 
@@ -19,17 +20,33 @@ class TelegramBot:
         self.session.verify = certifi.where()
         self.session.timeout = 10
 
+        # Keep-alive aiohttp session for async sends, created on first use
+        self.async_session: Optional[aiohttp.ClientSession] = None
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
     
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
     def close(self):
         """close requests session"""
         if self.session:
             self.session.close()
 
+    async def aclose(self):
+        """close both the requests session and the aiohttp ClientSession"""
+        self.close()
+        if self.async_session:
+            await self.async_session.close()
+            self.async_session = None
+
     def send_text(self, content: str, parse_mode: str = "HTML") -> Dict[str, Any]:
         """Send a text message to Telegram"""
         payload = {
@@ -39,6 +56,15 @@ class TelegramBot:
         }
         return self._send_message("sendMessage", payload)
 
+    async def send_text_async(self, content: str, parse_mode: str = "HTML") -> Dict[str, Any]:
+        """Send a text message to Telegram without blocking the event loop"""
+        payload = {
+            "chat_id": self.chat_id,
+            "text": content,
+            "parse_mode": parse_mode
+        }
+        return await self._send_message_async("sendMessage", payload)
+
     def _send_message(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Internal method to send messages to Telegram API"""
         url = f"{self.api_url}/{method}"
@@ -52,3 +78,45 @@ class TelegramBot:
         except Exception as e:
             print(f"Telegram send message failed: {e}")
             return {"ok": False, "error": str(e)}
+
+    async def _send_message_async(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of _send_message, reusing one keep-alive connection pool"""
+        if self.async_session is None or self.async_session.closed:
+            ssl_context = ssl.create_default_context(cafile=certifi.where())
+            self.async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=300, ssl=ssl_context),
+                timeout=aiohttp.ClientTimeout(total=10),
+                trust_env=True
+            )
+
+        url = f"{self.api_url}/{method}"
+
+        try:
+            async with self.async_session.post(url, json=payload) as response:
+                response_data = await response.json()
+                if not response_data.get("ok", False):
+                    print(f"Telegram send message failed: {response_data}")
+                return response_data
+        except Exception as e:
+            print(f"Telegram send message failed: {e}")
+            return {"ok": False, "error": str(e)}
+
+
+# (token, chat_id) -> TelegramBot shared by every bot in the process
+_shared_bots: Dict[Tuple[str, str], TelegramBot] = {}
+
+
+def get_telegram_bot(token: str, chat_id: str) -> TelegramBot:
+    """Shared TelegramBot per (token, chat_id) so every bot in the process reuses one connection pool"""
+    bot = _shared_bots.get((token, chat_id))
+    if bot is None:
+        bot = _shared_bots[(token, chat_id)] = TelegramBot(token, chat_id)
+    return bot
+
+
+async def close_telegram_bots():
+    """Close and forget every shared TelegramBot; call once at process shutdown, not from a single bot's cleanup"""
+    bots = list(_shared_bots.values())
+    _shared_bots.clear()
+    for bot in bots:
+        await bot.aclose()
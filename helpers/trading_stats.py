@@ -94,14 +94,15 @@ class TradingStats:
             if fell_back_to_market:
                 self.market_fallback_count += 1
     
-    def record_price_sample(self, bid: Decimal, ask: Decimal):
-        """Record a price sample for spread tracking"""
+    def record_price_sample(self, bid: Decimal, ask: Decimal,
+                            mid: Optional[Decimal] = None, spread: Optional[Decimal] = None):
+        """Record a price sample for spread tracking (mid/spread may be passed in if already computed)"""
         self.price_samples.append({
             'timestamp': time.time(),
             'bid': bid,
             'ask': ask,
-            'mid': (bid + ask) / 2,
-            'spread': ask - bid
+            'mid': (bid + ask) / 2 if mid is None else mid,
+            'spread': ask - bid if spread is None else spread
         })
 
     def get_ioc_success_rate(self) -> float:
@@ -12,6 +12,7 @@ import dotenv
 from decimal import Decimal
 from trading_bot import TradingBot, TradingConfig
 from exchanges import ExchangeFactory
+from helpers.telegram_bot import close_telegram_bots
 
 
 def parse_arguments():
@@ -137,6 +138,8 @@ async def main():
         print(f"Bot execution failed: {e}")
         # The bot's run method already handles graceful shutdown
         return
+    finally:
+        await close_telegram_bots()
 
 
 if __name__ == "__main__":
@@ -21,6 +21,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from hedge.hedge_mode_abc import Config, HedgeBotAbc, parse_arguments
 
 
+@pytest.fixture(autouse=True)
+def reset_bot_logger():
+    """Bots reuse handlers of an already configured logger; start each test clean"""
+    names = ("hedge_bot_TestExchange_BTC", "hedge_bot_OtherExchange_BTC")
+    for name in names:
+        logging.getLogger(name).handlers.clear()
+    yield
+    for name in names:
+        logging.getLogger(name).handlers.clear()
+
+
 class TestConfig:
     """Test the Config class"""
     
@@ -86,6 +97,7 @@ class ConcreteHedgeBot(HedgeBotAbc):
         client.place_open_order = AsyncMock()
         client.cancel_order = AsyncMock()
         client.connect = AsyncMock()
+        client.disconnect = AsyncMock()
         client.setup_order_update_handler = Mock()
         
         return client
@@ -187,10 +199,30 @@ class TestHedgeBotAbc:
     def test_initialize_logger(self, concrete_bot):
         """Test logger initialization"""
         assert concrete_bot.logger is not None
-        assert concrete_bot.logger.name == "hedge_bot_BTC"
+        assert concrete_bot.logger.name == "hedge_bot_TestExchange_BTC"
         assert concrete_bot.logger.level == logging.INFO
         assert concrete_bot.logger.propagate is False
-    
+
+    @patch('os.makedirs')
+    def test_initialize_logger_separates_exchanges(self, mock_makedirs, concrete_bot):
+        """Test bots with the same ticker on different exchanges log to their own files"""
+        first_logger = concrete_bot.logger
+        concrete_bot._exchange_name = "OtherExchange"
+        concrete_bot._initialize_log_file()
+        with patch('logging.FileHandler') as mock_file_handler:
+            concrete_bot._initialize_logger()
+
+        assert concrete_bot.logger is not first_logger
+        mock_file_handler.assert_called_once_with("logs/OtherExchange_BTC_hedge_mode_log.txt", delay=True)
+
+    def test_initialize_logger_reuses_handlers(self, concrete_bot):
+        """Test a second bot for the same ticker does not duplicate handlers"""
+        handlers = list(concrete_bot.logger.handlers)
+
+        concrete_bot._initialize_logger()
+
+        assert concrete_bot.logger.handlers == handlers
+
     def test_primary_client_initialization(self, concrete_bot):
         """Test primary client initialization"""
         assert concrete_bot.primary_client is not None
@@ -303,6 +335,31 @@ class TestHedgeBotAbc:
                 call(signal.SIGTERM, concrete_bot.shutdown)
             ]
             mock_signal.assert_has_calls(expected_calls)
+
+    @pytest.mark.asyncio
+    async def test_setup_signal_handlers_uses_running_loop(self, concrete_bot):
+        """Test signal handlers are registered on the running event loop"""
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, 'add_signal_handler') as mock_add, \
+             patch('signal.signal') as mock_signal:
+            concrete_bot.setup_signal_handlers()
+
+        mock_add.assert_has_calls([
+            call(signal.SIGINT, concrete_bot._request_stop),
+            call(signal.SIGTERM, concrete_bot._request_stop)
+        ])
+        mock_signal.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_shutdown_disconnects_primary(self, concrete_bot):
+        """Test async shutdown awaits the primary disconnect before cleanup"""
+        with patch.object(concrete_bot, 'shutdown') as mock_shutdown, \
+             patch.object(concrete_bot.logger, 'info'):
+            await concrete_bot._async_shutdown()
+
+        assert concrete_bot.stop_flag is True
+        concrete_bot.primary_client.disconnect.assert_awaited_once()
+        mock_shutdown.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_fetch_primary_bbo_prices_success(self, concrete_bot):
@@ -322,7 +379,43 @@ class TestHedgeBotAbc:
         
         with pytest.raises(Exception, match="TestExchange client not initialized"):
             await concrete_bot.fetch_primary_bbo_prices()
-    
+
+    @pytest.mark.asyncio
+    async def test_current_primary_bbo_prefers_websocket(self, concrete_bot):
+        """Test WebSocket-pushed BBO is used instead of REST once available"""
+        concrete_bot.primary_contract_id = "test_contract_123"
+
+        # No WS update yet: fall back to REST
+        assert await concrete_bot._current_primary_bbo() == (Decimal('50000.0'), Decimal('50001.0'))
+
+        with patch.object(concrete_bot.logger, 'info'):
+            await concrete_bot._setup_primary_websocket()
+        bbo_handler = concrete_bot.primary_client.setup_bbo_update_handler.call_args[0][0]
+        bbo_handler('49999.5', '50000.5')
+
+        assert await concrete_bot._current_primary_bbo() == (Decimal('49999.5'), Decimal('50000.5'))
+        concrete_bot.primary_client.fetch_bbo_prices.assert_called_once()
+
+        # A stale push is not trusted: back to REST
+        concrete_bot._bbo_time -= 60
+        assert await concrete_bot._current_primary_bbo() == (Decimal('50000.0'), Decimal('50001.0'))
+        assert concrete_bot.primary_client.fetch_bbo_prices.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_pushed_primary_bbo_respects_max_age(self, concrete_bot):
+        """Test the pushed BBO is only returned while it is fresh"""
+        assert concrete_bot.pushed_primary_bbo(1.0) is None
+
+        with patch.object(concrete_bot.logger, 'info'):
+            await concrete_bot._setup_primary_websocket()
+        bbo_handler = concrete_bot.primary_client.setup_bbo_update_handler.call_args[0][0]
+        with patch('time.monotonic', return_value=100.0):
+            bbo_handler('49999.5', '50000.5')
+        with patch('time.monotonic', return_value=100.5):
+            assert concrete_bot.pushed_primary_bbo(1.0) == (Decimal('49999.5'), Decimal('50000.5'))
+        with patch('time.monotonic', return_value=102.0):
+            assert concrete_bot.pushed_primary_bbo(1.0) is None
+
     def test_round_to_tick_with_tick_size(self, concrete_bot):
         """Test price rounding with tick size"""
         concrete_bot.primary_tick_size = Decimal('0.01')
@@ -332,6 +425,14 @@ class TestHedgeBotAbc:
         
         assert rounded == Decimal('50000.56')
     
+    def test_round_to_tick_with_non_decimal_tick_size(self, concrete_bot):
+        """Test rounding matches division when the tick's reciprocal does not terminate"""
+        concrete_bot.primary_tick_size = Decimal('0.03')
+
+        # 0.045 / 0.03 is exactly 1.5, which rounds half-even to 2 ticks
+        assert concrete_bot.round_to_tick(Decimal('0.045')) == Decimal('0.06')
+        assert concrete_bot.round_to_tick(Decimal('0.10')) == Decimal('0.09')
+
     def test_round_to_tick_no_tick_size(self, concrete_bot):
         """Test price rounding without tick size"""
         concrete_bot.primary_tick_size = None
@@ -373,18 +474,7 @@ class TestHedgeBotAbc:
         concrete_bot.primary_contract_id = "test_contract_123"
         concrete_bot.primary_order_status = None
         
-        order_data = {
-            'contract_id': 'test_contract_123',
-            'order_id': 'order_123',
-            'status': 'FILLED',
-            'side': 'buy',
-            'filled_size': '0.1',
-            'size': '0.1',
-            'price': '50000.0'
-        }
-        
-        with patch('hedge.hedge_mode_abc.log_trade_to_csv') as mock_log:
-            concrete_bot.handle_primary_order_update(order_data)
+        concrete_bot.handle_primary_order_update('buy', Decimal('0.1'), Decimal('50000.0'))
         
         assert concrete_bot.waiting_for_lighter_fill is True
         assert concrete_bot.current_lighter_side == 'sell'
@@ -395,23 +485,32 @@ class TestHedgeBotAbc:
         """Test order update handler for filled sell order"""
         concrete_bot.primary_contract_id = "test_contract_123"
         
-        order_data = {
-            'contract_id': 'test_contract_123',
-            'order_id': 'order_456',
-            'status': 'FILLED',
-            'side': 'sell',
-            'filled_size': '0.05',
-            'size': '0.05',
-            'price': '49999.0'
-        }
-        
-        concrete_bot.handle_primary_order_update(order_data)
+        concrete_bot.handle_primary_order_update('sell', Decimal('0.05'), Decimal('49999.0'))
         
         assert concrete_bot.waiting_for_lighter_fill is True
         assert concrete_bot.current_lighter_side == 'buy'
         assert concrete_bot.current_lighter_quantity == Decimal('0.05')
         assert concrete_bot.current_lighter_price == Decimal('49999.0')
     
+    @pytest.mark.asyncio
+    async def test_log_trade_queues_rows_for_writer_task(self, concrete_bot):
+        """Test trades are queued while the CSV writer task runs and flushed on shutdown"""
+        concrete_bot._loop = asyncio.get_running_loop()
+        concrete_bot._csv_task = Mock()
+
+        with patch('hedge.hedge_mode_abc.log_trade_to_csv') as mock_log, \
+             patch('hedge.hedge_mode_abc.write_trade_rows') as mock_write:
+            # Logged on the loop thread: the row is queued at once, no loop iteration needed before the flush
+            concrete_bot._log_trade('buy', '50000.0', '0.1')
+            concrete_bot._flush_csv_queue()
+
+        mock_log.assert_not_called()
+        mock_write.assert_called_once()
+        exchange, ticker, rows = mock_write.call_args[0]
+        assert (exchange, ticker) == ("TestExchange", "BTC")
+        assert [row[2:] for row in rows] == [['buy', '50000.0', '0.1']]
+        assert concrete_bot._csv_task is None
+
     def test_reset_order_state(self, concrete_bot):
         """Test order state reset"""
         concrete_bot.order_execution_complete = True
@@ -447,13 +546,28 @@ class TestHedgeBotAbc:
         # Mock time to trigger timeout and logger to avoid level issues
         with patch('time.time') as mock_time, \
              patch.object(concrete_bot.logger, 'error'):
-            mock_time.side_effect = [1000.0, 1181.0]  # 181 seconds later
+            mock_time.return_value = 1181.0  # 181 seconds later
             
             start_time = 1000.0
             result = await concrete_bot._wait_for_lighter_execution(start_time)
             
             assert result is False
     
+    @pytest.mark.asyncio
+    async def test_wait_for_lighter_execution_wakes_on_fill(self, concrete_bot):
+        """Test the wait wakes as soon as a primary fill is handled"""
+        async def fill_later():
+            await asyncio.sleep(0.01)
+            concrete_bot.handle_primary_order_update('buy', Decimal('0.1'), Decimal('50000.0'))
+
+        asyncio.create_task(fill_later())
+        result = await asyncio.wait_for(concrete_bot._wait_for_lighter_execution(time.time()), timeout=1)
+
+        assert result is True
+        concrete_bot.lighter.place_lighter_market_order.assert_called_once_with(
+            'sell', Decimal('0.1'), Decimal('50000.0')
+        )
+
     @pytest.mark.asyncio
     async def test_execute_hedge_position_success(self, concrete_bot):
         """Test successful hedge position execution"""
@@ -613,6 +727,28 @@ class TestHedgeBotAbc:
         # Should call shutdown which sets stop_flag
         mock_shutdown.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_run_concurrently_cancels_siblings_on_failure(self, concrete_bot):
+        """Test a failing startup coroutine cancels the others"""
+        slow_cancelled = False
+
+        async def slow():
+            nonlocal slow_cancelled
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                slow_cancelled = True
+                raise
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await concrete_bot._run_concurrently(slow(), failing())
+        await asyncio.sleep(0)
+
+        assert slow_cancelled is True
+
 
 class TestPostOnlyOrder:
     """Test place_primary_post_only_order method"""
@@ -677,24 +813,18 @@ class TestPostOnlyOrder:
         # Set initial status to None, then immediately set to FILLED
         concrete_bot.primary_order_status = None
         
-        call_count = 0
-        original_sleep = asyncio.sleep
-        
-        async def mock_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                # After first sleep, set status to FILLED to break the loop
-                concrete_bot.primary_order_status = 'FILLED'
-            await original_sleep(0.001)  # Very short real sleep to allow other tasks
+        async def mock_wait(timeout):
+            # Simulate the WebSocket delivering a FILLED update
+            concrete_bot.primary_order_status = 'FILLED'
         
-        with patch('asyncio.sleep', side_effect=mock_sleep), \
+        with patch.object(concrete_bot, '_wait_for_status_change', side_effect=mock_wait) as wait, \
              patch.object(concrete_bot.logger, 'info'):
             await concrete_bot.place_primary_post_only_order("buy", Decimal('0.1'))
         
         # Verify order was placed
         concrete_bot.place_bbo_order.assert_called_once_with("buy", Decimal('0.1'))
         assert concrete_bot.primary_order_status == 'FILLED'
+        assert wait.call_count == 1
     
     @pytest.mark.asyncio
     async def test_place_primary_post_only_order_canceled_and_replaced(self, concrete_bot):
@@ -704,9 +834,8 @@ class TestPostOnlyOrder:
         
         concrete_bot.primary_order_status = None
         call_count = 0
-        original_sleep = asyncio.sleep
         
-        async def mock_sleep(duration):
+        async def mock_wait(timeout):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -715,17 +844,32 @@ class TestPostOnlyOrder:
                 concrete_bot.primary_order_status = 'NEW'
             elif call_count >= 3:
                 concrete_bot.primary_order_status = 'FILLED'
-            await original_sleep(0.001)
         
-        with patch('asyncio.sleep', side_effect=mock_sleep), \
+        with patch.object(concrete_bot, '_wait_for_status_change', side_effect=mock_wait), \
              patch('time.time', return_value=1000.0), \
              patch.object(concrete_bot.logger, 'info'):
             await concrete_bot.place_primary_post_only_order("buy", Decimal('0.1'))
         
-        # Verify order was placed at least twice (original + replacement)
-        assert concrete_bot.place_bbo_order.call_count >= 1
+        # Verify order was placed twice (original + replacement)
+        assert concrete_bot.place_bbo_order.call_count == 2
         assert concrete_bot.primary_order_status == 'FILLED'
     
+    @pytest.mark.asyncio
+    async def test_place_primary_post_only_order_rejected_stops(self, concrete_bot):
+        """Test a rejected post-only order is not re-placed"""
+        concrete_bot.place_bbo_order = AsyncMock(return_value=("order_123", Decimal('50000.0')))
+
+        async def mock_wait(timeout):
+            concrete_bot.primary_order_status = 'REJECTED'
+
+        with patch.object(concrete_bot, '_wait_for_status_change', side_effect=mock_wait), \
+             patch.object(concrete_bot.logger, 'info'), \
+             patch.object(concrete_bot.logger, 'error') as mock_error:
+            await concrete_bot.place_primary_post_only_order("buy", Decimal('0.1'))
+
+        concrete_bot.place_bbo_order.assert_called_once()
+        mock_error.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_place_primary_post_only_order_no_client(self, concrete_bot):
         """Test post-only order when primary client is not initialized"""
@@ -740,18 +884,11 @@ class TestPostOnlyOrder:
         concrete_bot.place_bbo_order = AsyncMock(return_value=("order_123", Decimal('50000.0')))
         concrete_bot.primary_order_status = None
         
-        call_count = 0
-        original_sleep = asyncio.sleep
-        
-        async def mock_sleep(duration):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                # Set stop flag to break the loop
-                concrete_bot.stop_flag = True
-            await original_sleep(0.001)
+        async def mock_wait(timeout):
+            # Set stop flag to break the loop
+            concrete_bot._set_stop_flag(True)
         
-        with patch('asyncio.sleep', side_effect=mock_sleep), \
+        with patch.object(concrete_bot, '_wait_for_status_change', side_effect=mock_wait), \
              patch.object(concrete_bot.logger, 'info'):
             await concrete_bot.place_primary_post_only_order("buy", Decimal('0.1'))
         
@@ -759,6 +896,22 @@ class TestPostOnlyOrder:
         concrete_bot.place_bbo_order.assert_called_once()
         assert concrete_bot.stop_flag is True
 
+    @pytest.mark.asyncio
+    async def test_wait_for_status_change_wakes_on_event(self, concrete_bot):
+        """Test the status event wakes the waiter before the timeout"""
+        concrete_bot._notify_status_change()
+        
+        await asyncio.wait_for(concrete_bot._wait_for_status_change(10), timeout=1)
+        
+        assert not concrete_bot._status_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_wait_for_status_change_timeout(self, concrete_bot):
+        """Test the waiter returns after the timeout without an update"""
+        await concrete_bot._wait_for_status_change(0.01)
+        
+        assert not concrete_bot._status_event.is_set()
+
 
 class TestWebSocketOrderHandler:
     """Test WebSocket order update handler edge cases"""
@@ -881,8 +1034,8 @@ class TestWebSocketOrderHandler:
         
         # Should be treated as FILLED
         concrete_bot.handle_primary_order_update.assert_called_once()
-        call_args = concrete_bot.handle_primary_order_update.call_args[0][0]
-        assert call_args['status'] == 'FILLED'
+        concrete_bot.handle_primary_order_update.assert_called_once_with('buy', Decimal('0.1'), Decimal('50000.0'))
+        assert concrete_bot.primary_order_status == 'FILLED'
     
     @pytest.mark.asyncio
     async def test_order_update_handler_open_status(self, concrete_bot):
@@ -920,6 +1073,42 @@ class TestWebSocketOrderHandler:
         assert concrete_bot.primary_order_status == 'OPEN'
         # Don't check specific log calls as they can vary
 
+    @pytest.mark.asyncio
+    async def test_order_update_handler_normalizes_cancels(self, concrete_bot):
+        """Test cancel spellings are stored as CANCELED while REJECTED is kept raw"""
+        concrete_bot.primary_client = Mock()
+        concrete_bot.primary_client.setup_order_update_handler = Mock()
+        concrete_bot.primary_client.connect = AsyncMock()
+
+        handler_func = None
+        def capture_handler(handler):
+            nonlocal handler_func
+            handler_func = handler
+
+        concrete_bot.primary_client.setup_order_update_handler.side_effect = capture_handler
+
+        with patch.object(concrete_bot.logger, 'info'), \
+             patch.object(concrete_bot.logger, 'error'):
+            await concrete_bot._setup_primary_websocket()
+
+        order_data = {
+            'contract_id': 'test_contract_123',
+            'order_id': 'order_123',
+            'side': 'buy',
+            'filled_size': '0',
+            'size': '0.1',
+            'price': '50000.0'
+        }
+        cases = [
+            ({'status': 'CANCELLED'}, 'CANCELED'),
+            ({'status': 'CLOSED', 'cancel_reason': 'POST_ONLY_WOULD_CROSS'}, 'CANCELED'),
+            ({'status': 'REJECTED'}, 'REJECTED'),
+        ]
+        for update, expected in cases:
+            concrete_bot.primary_order_status = None
+            handler_func({**order_data, **update})
+            assert concrete_bot.primary_order_status == expected
+
 
 class TestPostOnlyOrderAdvanced:
     """Test advanced post-only order scenarios"""
@@ -983,21 +1172,20 @@ class TestPostOnlyOrderAdvanced:
         
         concrete_bot.primary_order_status = None
         call_count = 0
-        original_sleep = asyncio.sleep
         
-        async def mock_sleep(duration):
+        async def mock_wait(timeout):
             nonlocal call_count
             call_count += 1
-            if call_count <= 22:  # Allow enough calls to reach 10+ second timeout
+            if call_count <= 2:  # Stay open past the 10 second reprice deadline
                 concrete_bot.primary_order_status = 'OPEN'
             else:
                 concrete_bot.primary_order_status = 'FILLED'
-            await original_sleep(0.001)
+
         
         # Mock time.time() to simulate 15 seconds elapsed to trigger cancellation
         time_values = [1000.0] + [1015.0] * 30  # First call returns 1000, subsequent calls return 1015 (15 seconds later)
         
-        with patch('asyncio.sleep', side_effect=mock_sleep), \
+        with patch.object(concrete_bot, '_wait_for_status_change', side_effect=mock_wait), \
              patch('time.time', side_effect=time_values), \
              patch.object(concrete_bot.logger, 'info'), \
              patch.object(concrete_bot.logger, 'error'):
@@ -1016,21 +1204,20 @@ class TestPostOnlyOrderAdvanced:
         
         concrete_bot.primary_order_status = None
         call_count = 0
-        original_sleep = asyncio.sleep
         
-        async def mock_sleep(duration):
+        async def mock_wait(timeout):
             nonlocal call_count
             call_count += 1
-            if call_count <= 22:
+            if call_count <= 2:
                 concrete_bot.primary_order_status = 'OPEN'
             else:
                 concrete_bot.primary_order_status = 'FILLED'
-            await original_sleep(0.001)
+
         
         # Mock time.time() to simulate 15 seconds elapsed to trigger cancellation
         time_values = [1000.0] + [1015.0] * 30  # First call returns 1000, subsequent calls return 1015 (15 seconds later)
         
-        with patch('asyncio.sleep', side_effect=mock_sleep), \
+        with patch.object(concrete_bot, '_wait_for_status_change', side_effect=mock_wait), \
              patch('time.time', side_effect=time_values), \
              patch.object(concrete_bot.logger, 'info'), \
              patch.object(concrete_bot.logger, 'error'):
@@ -1054,21 +1241,20 @@ class TestPostOnlyOrderAdvanced:
         
         concrete_bot.primary_order_status = None
         call_count = 0
-        original_sleep = asyncio.sleep
         
-        async def mock_sleep(duration):
+        async def mock_wait(timeout):
             nonlocal call_count
             call_count += 1
-            if call_count <= 22:
+            if call_count <= 2:
                 concrete_bot.primary_order_status = 'OPEN'
             else:
                 concrete_bot.primary_order_status = 'FILLED'
-            await original_sleep(0.001)
+
         
         # Mock time.time() to simulate 15 seconds elapsed to trigger cancellation
         time_values = [1000.0] + [1015.0] * 30  # First call returns 1000, subsequent calls return 1015 (15 seconds later)
         
-        with patch('asyncio.sleep', side_effect=mock_sleep), \
+        with patch.object(concrete_bot, '_wait_for_status_change', side_effect=mock_wait), \
              patch('time.time', side_effect=time_values), \
              patch.object(concrete_bot.logger, 'info'), \
              patch.object(concrete_bot.logger, 'error') as mock_error:
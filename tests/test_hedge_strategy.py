@@ -19,7 +19,8 @@ from hedge.hedge_strategy import (
     HedgeStrategy, 
     SpreadSampler, 
     TimingController, 
-    SmartHedgeStrategy
+    SmartHedgeStrategy,
+    EXCHANGE_CONCURRENCY
 )
 
 
@@ -84,6 +85,7 @@ class TestSpreadSampler:
         assert spread_sampler.sample_count_range == (5, 10)
         assert spread_sampler.cache_duration == 60
         assert spread_sampler.spread_history == []
+        assert spread_sampler.last_sample is None
         assert spread_sampler.average_spread is None
         assert spread_sampler.last_update_time is None
         assert spread_sampler.logger is None
@@ -110,7 +112,68 @@ class TestSpreadSampler:
         assert sample['primary_mid'] == expected_primary_mid
         assert sample['lighter_mid'] == expected_lighter_mid
         assert sample['spread'] == expected_spread
+        assert sample['open_side'] == 'buy'  # primary_mid < lighter_mid
     
+    @pytest.mark.asyncio
+    async def test_sample_current_spread_times_out_hung_fetch(self, spread_sampler, mock_primary_client, mock_lighter_proxy):
+        """Test a hung exchange call is cancelled after fetch_timeout instead of stalling the loop"""
+        spread_sampler.fetch_timeout = 0.05
+        cancelled = False
+
+        async def hung_bbo(contract_id):
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        mock_primary_client.fetch_bbo_prices.side_effect = hung_bbo
+
+        with pytest.raises(asyncio.TimeoutError):
+            await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy)
+        assert cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_sample_current_spread_uses_given_contract_id(self, spread_sampler, mock_primary_client, mock_lighter_proxy):
+        """Test a precomputed contract_id is used instead of the client config"""
+        await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy, "cached_contract")
+
+        mock_primary_client.fetch_bbo_prices.assert_called_once_with("cached_contract")
+
+    @pytest.mark.asyncio
+    async def test_sample_current_spread_reuses_fresh_sample(self, spread_sampler, mock_primary_client, mock_lighter_proxy):
+        """Test max_age reuses the latest sample instead of fetching again"""
+        first = await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy)
+        reused = await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy, max_age=60)
+        await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy)
+
+        assert reused is first
+        assert mock_primary_client.fetch_bbo_prices.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sample_current_spread_bounded_concurrency(self, spread_sampler, mock_primary_client, mock_lighter_proxy):
+        """Test concurrent samples never exceed the per-exchange request limit"""
+        in_flight = 0
+        peak = 0
+
+        async def slow_bbo(*args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Decimal('2000.5'), Decimal('2001.0')
+
+        mock_primary_client.fetch_bbo_prices = AsyncMock(side_effect=slow_bbo)
+        samples = await asyncio.gather(*(
+            spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy)
+            for _ in range(EXCHANGE_CONCURRENCY * 3)
+        ))
+
+        assert len(samples) == EXCHANGE_CONCURRENCY * 3
+        assert peak == EXCHANGE_CONCURRENCY
+
     @pytest.mark.asyncio
     async def test_sample_current_spread_with_exception(self, spread_sampler, mock_primary_client, mock_lighter_proxy, mock_logger):
         """Test sampling with exception handling"""
@@ -122,6 +185,19 @@ class TestSpreadSampler:
         
         mock_logger.error.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_sample_current_spread_lighter_failure_waits_for_both(self, spread_sampler, mock_primary_client,
+                                                                        mock_lighter_proxy, mock_logger):
+        """Test a one-sided failure is raised after both requests have completed"""
+        spread_sampler.logger = mock_logger
+        mock_lighter_proxy.fetch_bbo_prices.side_effect = Exception("Lighter down")
+
+        with pytest.raises(Exception, match="Lighter down"):
+            await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy)
+
+        mock_primary_client.fetch_bbo_prices.assert_awaited_once()
+        mock_logger.error.assert_called_once()
+
     @pytest.mark.asyncio
     @patch('random.randint')
     @patch('random.uniform') 
@@ -159,8 +235,79 @@ class TestSpreadSampler:
         assert avg_spread == Decimal('0.5')
         assert spread_sampler.average_spread == Decimal('0.5')
         assert len(spread_sampler.spread_history) == 3
+        assert spread_sampler.spread_history == [Decimal('0.5')] * 3
+        assert spread_sampler.last_sample['primary_bid'] == Decimal('2000.1')
         mock_logger.info.assert_called()
     
+    @pytest.mark.asyncio
+    @patch('random.randint')
+    @patch('asyncio.sleep')
+    async def test_calculate_average_spread_stops_early_when_converged(self, mock_sleep, mock_randint, spread_sampler,
+                                                                       mock_primary_client, mock_lighter_proxy):
+        """Test sampling stops once the mean has converged instead of drawing every sample"""
+        mock_randint.return_value = 10
+        mock_sleep.return_value = None
+
+        avg_spread = await spread_sampler.calculate_average_spread(mock_primary_client, mock_lighter_proxy)
+
+        # Identical samples only count as converged once min_flat_samples have been drawn
+        assert avg_spread == Decimal('0.3')
+        assert mock_primary_client.fetch_bbo_prices.await_count == spread_sampler.min_flat_samples
+        assert mock_sleep.await_count == spread_sampler.min_flat_samples - 1
+
+    def test_has_converged_requires_more_samples_without_variance(self, spread_sampler):
+        """Test zero variance is not treated as converged after only a few samples"""
+        mean = Decimal('0.3')
+        assert spread_sampler._has_converged(3, mean, Decimal('0')) is False
+        assert spread_sampler._has_converged(spread_sampler.min_flat_samples, mean, Decimal('0')) is True
+        # Small but non-zero variance still converges at min_samples
+        assert spread_sampler._has_converged(3, mean, Decimal('0.00001')) is True
+
+    @pytest.mark.asyncio
+    @patch('random.randint')
+    @patch('random.uniform')
+    @patch('time.monotonic')
+    @patch('asyncio.sleep')
+    async def test_calculate_average_spread_interval_includes_fetch_time(self, mock_sleep, mock_time, mock_uniform, mock_randint,
+                                                                       spread_sampler, mock_primary_client, mock_lighter_proxy):
+        """Test the sampling interval is measured from request start, so fetch latency is not added on top"""
+        mock_randint.return_value = 3
+        mock_uniform.return_value = 1.0
+        mock_sleep.return_value = None
+        clock = [0.0]
+        mock_time.side_effect = lambda: clock[0]
+        fetch_latencies = iter([0.4, 1.5, 0.1])
+
+        async def slow_bbo(contract_id):
+            clock[0] += next(fetch_latencies)
+            return Decimal('2000.5'), Decimal('2001.0')
+
+        mock_primary_client.fetch_bbo_prices.side_effect = slow_bbo
+
+        await spread_sampler.calculate_average_spread(mock_primary_client, mock_lighter_proxy)
+
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [pytest.approx(0.6), 0]
+
+    @pytest.mark.asyncio
+    @patch('random.randint')
+    @patch('asyncio.sleep')
+    async def test_calculate_average_spread_keeps_sampling_noisy_spreads(self, mock_sleep, mock_randint, spread_sampler,
+                                                                        mock_primary_client, mock_lighter_proxy):
+        """Test noisy spreads are sampled up to the drawn sample count"""
+        mock_randint.return_value = 4
+        mock_sleep.return_value = None
+        lighter_asks = iter([Decimal('2001.3'), Decimal('2005.3'), Decimal('2001.3'), Decimal('2009.3')])
+
+        async def noisy_lighter():
+            return Decimal('2000.8'), next(lighter_asks)
+
+        mock_lighter_proxy.fetch_bbo_prices.side_effect = noisy_lighter
+
+        await spread_sampler.calculate_average_spread(mock_primary_client, mock_lighter_proxy)
+
+        assert len(spread_sampler.spread_history) == 4
+        assert mock_sleep.await_count == 3
+
     @pytest.mark.asyncio
     async def test_calculate_average_spread_insufficient_samples(self, spread_sampler, mock_primary_client, mock_lighter_proxy):
         """Test calculating average spread with insufficient samples"""
@@ -174,12 +321,42 @@ class TestSpreadSampler:
     async def test_calculate_average_spread_cache(self, spread_sampler):
         """Test average spread caching functionality"""
         spread_sampler.average_spread = Decimal('0.5')
-        spread_sampler.last_update_time = time.time()
+        spread_sampler.last_update_time = time.monotonic()
         
         # Should return cached value when force_refresh=False
         result = await spread_sampler.calculate_average_spread(Mock(), Mock(), force_refresh=False)
         assert result == Decimal('0.5')
     
+    def test_robust_mean_drops_outliers(self):
+        """Test a single spike is excluded from the average spread"""
+        spreads = [Decimal('0.5'), Decimal('0.6'), Decimal('0.4'), Decimal('0.5'), Decimal('5.0')]
+        mean = sum(spreads) / len(spreads)
+
+        assert SpreadSampler._robust_mean(spreads, mean) == Decimal('0.5')
+        assert SpreadSampler._robust_mean([Decimal('0.5')] * 3, Decimal('0.5')) == Decimal('0.5')
+
+    def test_cache_validity_follows_recent_spread_drift(self, spread_sampler):
+        """Test the average spread cache is extended on quiet markets and dropped on drift"""
+        spread_sampler.average_spread = Decimal('0.5')
+        spread_sampler.last_update_time = 1000.0
+
+        spread_sampler.recent_spread_ewma = Decimal('0.52')
+        assert spread_sampler._is_cache_valid(1000.0 + 60 * 3) is True  # beyond cache_duration, still quiet
+        assert spread_sampler._is_cache_valid(1000.0 + 60 * 4) is False  # extension cap reached
+
+        spread_sampler.recent_spread_ewma = Decimal('0.8')
+        assert spread_sampler._is_cache_valid(1000.0 + 1) is False
+
+    @pytest.mark.asyncio
+    async def test_sample_current_spread_updates_ewma(self, spread_sampler, mock_primary_client, mock_lighter_proxy):
+        """Test every sample feeds the recent spread EWMA"""
+        await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy)
+        assert spread_sampler.recent_spread_ewma == Decimal('0.3')
+
+        spread_sampler.recent_spread_ewma = Decimal('1.3')
+        await spread_sampler.sample_current_spread(mock_primary_client, mock_lighter_proxy)
+        assert spread_sampler.recent_spread_ewma == Decimal('1.2')
+
     def test_should_open_by_spread(self, spread_sampler):
         """Test spread-based open decision"""
         # No average spread set
@@ -211,6 +388,15 @@ class TestSpreadSampler:
         # Current spread <= average but below profit threshold - should not close
         assert not spread_sampler.should_close_by_spread(Decimal('0.4'), profit_threshold=Decimal('0.05'))
 
+    def test_should_close_by_spread_uses_precomputed_threshold(self):
+        """Test the threshold passed at construction is used when none is given per call"""
+        sampler = SpreadSampler(profit_threshold=0.1)
+        sampler.average_spread = Decimal('0.5')
+
+        assert sampler._one_minus_threshold == Decimal('0.9')
+        assert sampler.should_close_by_spread(Decimal('0.46'))
+        assert not sampler.should_close_by_spread(Decimal('0.44'))
+
 
 class TestTimingController:
     """Test the TimingController class"""
@@ -249,7 +435,7 @@ class TestTimingController:
         mock_uniform.assert_not_called()
     
     @patch('random.uniform')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_schedule_next_open_subsequent_trade(self, mock_time, mock_uniform, timing_controller, mock_logger):
         """Test scheduling next open for subsequent trades"""
         timing_controller.logger = mock_logger
@@ -266,7 +452,7 @@ class TestTimingController:
         mock_logger.info.assert_called_once()
     
     @patch('random.uniform')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_schedule_next_close(self, mock_time, mock_uniform, timing_controller, mock_logger):
         """Test scheduling next close"""
         timing_controller.logger = mock_logger
@@ -280,7 +466,7 @@ class TestTimingController:
         mock_uniform.assert_called_once_with(30, 120)
         mock_logger.info.assert_called_once()
     
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_can_open_by_time(self, mock_time, timing_controller):
         """Test time-based open decision"""
         mock_time.return_value = 1000.0
@@ -302,7 +488,7 @@ class TestTimingController:
         timing_controller.next_open_time = 500.0
         assert timing_controller.can_open_by_time() is True
     
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_should_close_by_time(self, mock_time, timing_controller):
         """Test time-based close decision"""
         mock_time.return_value = 1000.0
@@ -318,7 +504,7 @@ class TestTimingController:
         timing_controller.next_close_time = 500.0
         assert timing_controller.should_close_by_time() is True
     
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_record_close(self, mock_time, timing_controller):
         """Test recording close time"""
         mock_time.return_value = 1000.0
@@ -330,6 +516,16 @@ class TestTimingController:
         assert timing_controller.is_first_trade is False
         assert timing_controller.next_close_time is None
 
+    def test_remaining_to_open_and_close(self, timing_controller):
+        """Test remaining seconds until scheduled open/close"""
+        assert timing_controller.remaining_to_open(1000.0) == 0.0
+        assert timing_controller.remaining_to_close(1000.0) == 0.0
+
+        timing_controller.next_open_time = 1090.0
+        timing_controller.next_close_time = 900.0
+        assert timing_controller.remaining_to_open(1000.0) == 90.0
+        assert timing_controller.remaining_to_close(1000.0) == 0.0
+
 
 class TestSmartHedgeStrategy:
     """Test the SmartHedgeStrategy class"""
@@ -363,6 +559,8 @@ class TestSmartHedgeStrategy:
         hedge_bot.primary_client.config = Mock()
         hedge_bot.primary_client.config.contract_id = "test_contract"
         hedge_bot.primary_client.fetch_bbo_prices = AsyncMock(return_value=(Decimal('2000.5'), Decimal('2001.0')))
+        # No WebSocket-pushed Primary BBO: sampling falls back to REST
+        hedge_bot.pushed_primary_bbo = Mock(return_value=None)
         
         # Mock lighter proxy
         hedge_bot.lighter = Mock()
@@ -390,7 +588,7 @@ class TestSmartHedgeStrategy:
         assert smart_strategy.spread_sampler.logger == mock_hedge_bot.logger
         assert smart_strategy.timing_controller.logger == mock_hedge_bot.logger
     
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_is_open_timeout(self, mock_time, smart_strategy):
         """Test open timeout checking"""
         mock_time.return_value = 1000.0
@@ -406,7 +604,7 @@ class TestSmartHedgeStrategy:
         smart_strategy.open_decision_start_time = 1000.0 - (6 * 60)  # 6 minutes ago
         assert smart_strategy._is_open_timeout() is True
     
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_is_close_timeout(self, mock_time, smart_strategy):
         """Test close timeout checking"""
         mock_time.return_value = 1000.0
@@ -422,6 +620,90 @@ class TestSmartHedgeStrategy:
         smart_strategy.close_decision_start_time = 1000.0 - (12 * 60)  # 12 minutes ago
         assert smart_strategy._is_close_timeout() is True
     
+    def test_poll_delay_wakes_at_nearest_deadline(self, smart_strategy):
+        """Test the poll delay is capped by sleep_time and shortened near a deadline"""
+        smart_strategy.sleep_time = 30
+
+        assert smart_strategy._poll_delay(1000.0, None) == 30
+        assert smart_strategy._poll_delay(1000.0, 1100.0, None) == 30
+        assert smart_strategy._poll_delay(1000.0, 1005.0, 2000.0) == 5
+        assert smart_strategy._poll_delay(1000.0, 900.0) == 0.1
+
+    @pytest.mark.asyncio
+    async def test_sample_prefers_pushed_primary_bbo(self, smart_strategy, mock_hedge_bot):
+        """Test the bound sampler reads a fresh pushed Primary BBO instead of calling REST"""
+        mock_hedge_bot.pushed_primary_bbo.return_value = (Decimal('2000.5'), Decimal('2001.0'))
+
+        smart_strategy._setup_logger(mock_hedge_bot)
+        sample = await smart_strategy._sample()
+
+        assert sample['primary_mid'] == Decimal('2000.75')
+        mock_hedge_bot.pushed_primary_bbo.assert_called_once_with(smart_strategy.bbo_max_age)
+        mock_hedge_bot.primary_client.fetch_bbo_prices.assert_not_called()
+
+    def test_should_log_wait_throttles(self, smart_strategy):
+        """Test the waiting log is emitted at most once per wait_log_interval"""
+        assert smart_strategy._should_log_wait(1000.0) is True
+        assert smart_strategy._should_log_wait(1030.0) is False
+        assert smart_strategy._should_log_wait(1060.0) is True
+
+    @pytest.mark.asyncio
+    async def test_sleep_until_tick_wakes_on_bbo_change(self, smart_strategy, mock_hedge_bot):
+        """Test the poll wait ends early when the Lighter BBO changes"""
+        smart_strategy.min_poll_interval = 0.01
+        mock_hedge_bot.lighter.bbo_changed = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, mock_hedge_bot.lighter.bbo_changed.set)
+
+        start = time.monotonic()
+        await smart_strategy._sleep_until_tick(mock_hedge_bot, 5)
+
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_sleep_until_tick_ignores_small_lighter_moves(self, smart_strategy, mock_hedge_bot):
+        """Test BBO pushes that barely move the Lighter mid do not end the poll wait early"""
+        smart_strategy.min_poll_interval = 0.01
+        smart_strategy.spread_sampler.average_spread = Decimal('1.0')
+        smart_strategy.spread_sampler.last_sample = {'lighter_mid': Decimal('2000.0')}
+        lighter = mock_hedge_bot.lighter
+        lighter.bbo_changed = asyncio.Event()
+        lighter.lighter_best_bid, lighter.lighter_best_ask = Decimal('1999.99'), Decimal('2000.03')
+
+        def move(bid, ask):
+            lighter.lighter_best_bid, lighter.lighter_best_ask = bid, ask
+            lighter.bbo_changed.set()
+
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.03, lighter.bbo_changed.set)
+        loop.call_later(0.1, move, Decimal('2000.1'), Decimal('2000.3'))
+
+        start = time.monotonic()
+        await smart_strategy._sleep_until_tick(mock_hedge_bot, 5)
+
+        assert 0.1 <= time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    @patch('asyncio.sleep')
+    async def test_sleep_until_tick_without_event_sleeps(self, mock_sleep, smart_strategy, mock_hedge_bot):
+        """Test bots without a BBO event fall back to a plain sleep"""
+        await smart_strategy._sleep_until_tick(mock_hedge_bot, 5)
+
+        mock_sleep.assert_called_once_with(5)
+
+    def test_timeout_checks_accept_explicit_now(self, smart_strategy):
+        """Test timeout and timing checks can reuse a caller-supplied timestamp"""
+        smart_strategy.open_decision_start_time = 1000.0
+        smart_strategy.close_decision_start_time = 1000.0
+        assert smart_strategy._is_open_timeout(1000.0 + 6 * 60) is True
+        assert smart_strategy._is_close_timeout(1000.0 + 6 * 60) is False
+
+        controller = smart_strategy.timing_controller
+        controller.is_first_trade = False
+        controller.next_open_time = 1500.0
+        controller.next_close_time = 1500.0
+        assert controller.can_open_by_time(1499.0) is False
+        assert controller.should_close_by_time(1500.0) is True
+
     def test_reset_open_decision_time(self, smart_strategy):
         """Test resetting open decision time"""
         smart_strategy.open_decision_start_time = 1000.0
@@ -435,7 +717,7 @@ class TestSmartHedgeStrategy:
         assert smart_strategy.close_decision_start_time is None
     
     @pytest.mark.asyncio
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('asyncio.sleep')
     async def test_wait_open_first_trade_spread_favorable(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
         """Test wait_open for first trade with favorable spread"""
@@ -448,6 +730,7 @@ class TestSmartHedgeStrategy:
             'spread': Decimal('0.6'),
             'primary_mid': Decimal('2000.75'),
             'lighter_mid': Decimal('2001.05'),
+            'open_side': 'buy',
             'primary_bid': Decimal('2000.5'),
             'primary_ask': Decimal('2001.0'),
             'lighter_bid': Decimal('2000.8'),
@@ -470,7 +753,7 @@ class TestSmartHedgeStrategy:
         smart_strategy.timing_controller.schedule_next_close.assert_called_once()
     
     @pytest.mark.asyncio
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('asyncio.sleep')
     async def test_wait_open_timeout_protection(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
         """Test wait_open timeout protection"""
@@ -498,6 +781,7 @@ class TestSmartHedgeStrategy:
             'spread': Decimal('0.3'),
             'primary_mid': Decimal('2000.75'),
             'lighter_mid': Decimal('2001.05'),
+            'open_side': 'buy',
             'primary_bid': Decimal('2000.5'),
             'primary_ask': Decimal('2001.0'),
             'lighter_bid': Decimal('2000.8'),
@@ -515,7 +799,7 @@ class TestSmartHedgeStrategy:
         smart_strategy.timing_controller.schedule_next_close.assert_called()
     
     @pytest.mark.asyncio
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('asyncio.sleep')
     async def test_wait_close_spread_favorable(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
         """Test wait_close with favorable spread"""
@@ -527,6 +811,7 @@ class TestSmartHedgeStrategy:
             'spread': Decimal('0.4'),
             'primary_mid': Decimal('2000.75'),
             'lighter_mid': Decimal('2001.05'),
+            'open_side': 'buy',
             'timestamp': 1000.0
         })
         smart_strategy.spread_sampler.should_close_by_spread = Mock(return_value=True)
@@ -544,7 +829,7 @@ class TestSmartHedgeStrategy:
         smart_strategy.timing_controller.schedule_next_open.assert_called_once()
     
     @pytest.mark.asyncio
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('asyncio.sleep')
     async def test_wait_close_time_based(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
         """Test wait_close with time-based trigger"""
@@ -570,6 +855,65 @@ class TestSmartHedgeStrategy:
         smart_strategy.timing_controller.record_close.assert_called_once()
         smart_strategy.timing_controller.schedule_next_open.assert_called_once()
     
+    @pytest.mark.asyncio
+    @patch('time.monotonic')
+    @patch('asyncio.sleep')
+    async def test_wait_open_error_retry_wakes_at_timeout_deadline(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
+        """Test the error retry sleep is cut short by the open timeout deadline"""
+        smart_strategy.open_decision_start_time = 1000.0
+        mock_time.return_value = 1000.0 + 5 * 60 - 0.5
+        smart_strategy.timing_controller.is_first_trade = False
+        smart_strategy.spread_sampler.sample_current_spread = AsyncMock(side_effect=Exception("Network error"))
+
+        def stop(_delay):
+            mock_hedge_bot.stop_flag = True
+        mock_sleep.side_effect = stop
+
+        with pytest.raises(asyncio.CancelledError):
+            await smart_strategy.wait_open(mock_hedge_bot)
+
+        mock_sleep.assert_called_once_with(pytest.approx(0.5))
+
+    @pytest.mark.asyncio
+    @patch('time.monotonic')
+    @patch('asyncio.sleep')
+    async def test_wait_close_error_after_timeout_forces_close(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
+        """Test a failing close loop exits once the close timeout has passed"""
+        smart_strategy.close_decision_start_time = 1000.0
+        mock_time.return_value = 1000.0 + 10 * 60
+        smart_strategy.spread_sampler.sample_current_spread = AsyncMock(side_effect=Exception("Network error"))
+
+        await smart_strategy.wait_close(mock_hedge_bot)
+
+        assert smart_strategy.close_decision_start_time is None
+        mock_sleep.assert_not_called()
+        mock_hedge_bot.logger.warning.assert_any_call("⚠️ 策略执行失败且超时，强制%s", "平仓")
+
+    @pytest.mark.asyncio
+    @patch('random.randint', return_value=3)
+    @patch('asyncio.sleep')
+    async def test_wait_open_recalibrates_only_when_cache_invalid(self, mock_sleep, mock_randint, smart_strategy, mock_hedge_bot):
+        """Test later opens reuse the cached average spread until EWMA drift invalidates it"""
+        sampler = smart_strategy.spread_sampler
+        smart_strategy.timing_controller.is_first_trade = False
+        smart_strategy.timing_controller.can_open_by_time = Mock(return_value=True)
+        smart_strategy.timing_controller.schedule_next_close = Mock()
+        sampler.sample_current_spread = AsyncMock(return_value={'spread': Decimal('0.9'), 'open_side': 'buy'})
+        sampler.average_spread = Decimal('0.5')
+        sampler.last_update_time = time.monotonic()
+
+        # Recent spreads close to the average: cached baseline is kept
+        sampler.recent_spread_ewma = Decimal('0.52')
+        await smart_strategy.wait_open(mock_hedge_bot)
+        assert sampler.sample_current_spread.await_count == 1
+        assert sampler.average_spread == Decimal('0.5')
+
+        # Recent spreads drifted far away: baseline is resampled before deciding
+        sampler.recent_spread_ewma = Decimal('0.9')
+        await smart_strategy.wait_open(mock_hedge_bot)
+        assert sampler.sample_current_spread.await_count == 1 + 3 + 1
+        assert sampler.average_spread == Decimal('0.9')
+
     @pytest.mark.asyncio
     async def test_wait_open_cancelled_error(self, smart_strategy, mock_hedge_bot):
         """Test wait_open with stop_flag set"""
@@ -716,6 +1060,82 @@ class TestSmartHedgeStrategy:
         assert result is False  # Should handle exception gracefully
         mock_hedge_bot.logger.error.assert_called()  # Should log the error
     
+    @pytest.mark.asyncio
+    async def test_check_liquidation_risk_uses_prefetched_prices(self, smart_strategy, mock_hedge_bot):
+        """Test liquidation risk check does not refetch when prices are passed in"""
+        mock_hedge_bot.primary_client.get_ticker_position_liquidation_price = AsyncMock(return_value=1500.0)
+        mock_hedge_bot.lighter.get_ticker_position_liquidation_price = AsyncMock(return_value=1500.0)
+
+        current_sample = {
+            'primary_mid': 2000.75,
+            'lighter_mid': 2001.05
+        }
+
+        result = await smart_strategy._check_liquidation_risk(mock_hedge_bot, current_sample, [2100.0, 1500.0])
+
+        assert result is True
+        mock_hedge_bot.primary_client.get_ticker_position_liquidation_price.assert_not_called()
+        mock_hedge_bot.lighter.get_ticker_position_liquidation_price.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch('time.monotonic')
+    async def test_fetch_liquidation_prices_cached_within_ttl(self, mock_monotonic, smart_strategy, mock_hedge_bot):
+        """Test liquidation prices are reused within the TTL and failures are not cached"""
+        mock_monotonic.return_value = 1000.0
+        mock_hedge_bot.primary_client.get_ticker_position_liquidation_price = AsyncMock(return_value=1500.0)
+        mock_hedge_bot.lighter.get_ticker_position_liquidation_price = AsyncMock(side_effect=Exception("Lighter API error"))
+
+        first = await smart_strategy._fetch_liquidation_prices(mock_hedge_bot)
+        assert first[0] == 1500.0
+        assert isinstance(first[1], Exception)
+
+        mock_hedge_bot.lighter.get_ticker_position_liquidation_price = AsyncMock(return_value=2500.0)
+        mock_monotonic.return_value = 1010.0
+        assert await smart_strategy._fetch_liquidation_prices(mock_hedge_bot) == [1500.0, 2500.0]
+        assert mock_hedge_bot.primary_client.get_ticker_position_liquidation_price.await_count == 1
+
+        mock_monotonic.return_value = 1016.0
+        await smart_strategy._fetch_liquidation_prices(mock_hedge_bot)
+        assert mock_hedge_bot.primary_client.get_ticker_position_liquidation_price.await_count == 2
+        assert mock_hedge_bot.lighter.get_ticker_position_liquidation_price.await_count == 1
+
+    @pytest.mark.asyncio
+    @patch('time.monotonic')
+    async def test_fetch_liquidation_prices_extended_when_far_from_danger(self, mock_monotonic, smart_strategy, mock_hedge_bot):
+        """Test an expired liquidation price is kept while the market is far from it"""
+        mock_monotonic.return_value = 1000.0
+        mock_hedge_bot.primary_client.get_ticker_position_liquidation_price = AsyncMock(return_value=Decimal('1000'))
+        mock_hedge_bot.lighter.get_ticker_position_liquidation_price = AsyncMock(return_value=Decimal('1800'))
+        smart_strategy.spread_sampler.last_sample = {'primary_mid': Decimal('2000'), 'lighter_mid': Decimal('2000')}
+
+        await smart_strategy._fetch_liquidation_prices(mock_hedge_bot)
+        mock_monotonic.return_value = 1100.0
+        assert await smart_strategy._fetch_liquidation_prices(mock_hedge_bot) == [Decimal('1000'), Decimal('1800')]
+
+        # Primary is 100% away and reused; Lighter is only ~11% away and refetched
+        assert mock_hedge_bot.primary_client.get_ticker_position_liquidation_price.await_count == 1
+        assert mock_hedge_bot.lighter.get_ticker_position_liquidation_price.await_count == 2
+
+        mock_monotonic.return_value = 1000.0 + smart_strategy.liquidation_far_ttl
+        await smart_strategy._fetch_liquidation_prices(mock_hedge_bot)
+        assert mock_hedge_bot.primary_client.get_ticker_position_liquidation_price.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_liquidation_prices_times_out_stuck_exchange(self, smart_strategy, mock_hedge_bot):
+        """Test a hanging exchange times out without holding back the other side"""
+        async def hang():
+            await asyncio.sleep(10)
+
+        smart_strategy.liquidation_fetch_timeout = 0.05
+        mock_hedge_bot.primary_client.get_ticker_position_liquidation_price = AsyncMock(return_value=1500.0)
+        mock_hedge_bot.lighter.get_ticker_position_liquidation_price = hang
+
+        results = await smart_strategy._fetch_liquidation_prices(mock_hedge_bot)
+
+        assert results[0] == 1500.0
+        assert isinstance(results[1], asyncio.TimeoutError)
+        assert 'lighter' not in smart_strategy._liquidation_cache
+
     def test_check_single_exchange_risk_safe(self, smart_strategy):
         """Test single exchange risk check - safe case"""
         logger = Mock()
@@ -795,7 +1215,7 @@ class TestSmartHedgeStrategy:
         logger.warning.assert_not_called()
     
     @pytest.mark.asyncio
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('asyncio.sleep')
     async def test_wait_close_with_risk_control_trigger(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
         """Test wait_close with risk control triggering immediate close"""
@@ -811,6 +1231,7 @@ class TestSmartHedgeStrategy:
             'spread': Decimal('0.6'),
             'primary_mid': 2000.75,  # Close to liquidation price 2100
             'lighter_mid': 2001.05,
+            'open_side': 'buy',
             'timestamp': 1000.0
         })
         
@@ -826,7 +1247,7 @@ class TestSmartHedgeStrategy:
         smart_strategy.timing_controller.schedule_next_open.assert_called_once()
     
     @pytest.mark.asyncio
-    @patch('time.time')
+    @patch('time.monotonic')
     @patch('asyncio.sleep')
     async def test_wait_close_risk_control_no_trigger(self, mock_sleep, mock_time, smart_strategy, mock_hedge_bot):
         """Test wait_close with risk control not triggering"""
@@ -842,6 +1263,7 @@ class TestSmartHedgeStrategy:
             'spread': Decimal('0.4'),
             'primary_mid': 2000.75,  # Safe distance from liquidation
             'lighter_mid': 2001.05,
+            'open_side': 'buy',
             'timestamp': 1000.0
         })
         smart_strategy.spread_sampler.should_close_by_spread = Mock(return_value=True)
@@ -0,0 +1,35 @@
+import csv
+
+from helpers import logger as trade_logger
+from helpers.logger import log_trade_to_csv
+
+
+def test_log_trade_to_csv_reuses_writer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    log_trade_to_csv("edgex", "BTC", "buy", "100.5", "0.1")
+    log_trade_to_csv("edgex", "BTC", "sell", "101", "0.1")
+    trade_logger._close_writers()
+
+    with open(tmp_path / "logs" / "edgex_BTC_hedge_mode_trades.csv", newline="") as handle:
+        rows = list(csv.reader(handle))
+
+    assert rows[0] == ["exchange", "timestamp", "side", "price", "quantity"]
+    assert [row[2:] for row in rows[1:]] == [["buy", "100.5", "0.1"], ["sell", "101", "0.1"]]
+
+
+def test_log_trade_to_csv_appends_without_duplicate_header(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    log_trade_to_csv("edgex", "ETH", "buy", "10", "1")
+    trade_logger._close_writers()
+    log_trade_to_csv("edgex", "ETH", "sell", "11", "1")
+    trade_logger._close_writers()
+
+    with open(tmp_path / "logs" / "edgex_ETH_hedge_mode_trades.csv", newline="") as handle:
+        rows = list(csv.reader(handle))
+
+    assert len(rows) == 3
+    assert rows[0][0] == "exchange"
@@ -0,0 +1,30 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from helpers.loop_monitor import enable_slow_callback_warnings, monitor_loop_lag
+
+
+@pytest.mark.asyncio
+async def test_monitor_loop_lag_warns_on_blocking_call(caplog):
+    task = asyncio.create_task(monitor_loop_lag(interval=0.01, threshold=0.05))
+    await asyncio.sleep(0)
+    with caplog.at_level(logging.WARNING, logger="helpers.loop_monitor"):
+        time.sleep(0.1)  # deliberately block the loop
+        await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert any("Event loop blocked" in record.getMessage() for record in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_enable_slow_callback_warnings_sets_threshold():
+    loop = asyncio.get_running_loop()
+    enable_slow_callback_warnings(threshold=0.2)
+    try:
+        assert loop.get_debug() is True
+        assert loop.slow_callback_duration == 0.2
+    finally:
+        loop.set_debug(False)
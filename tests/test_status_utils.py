@@ -0,0 +1,72 @@
+"""
+Unit tests for exchanges/status_utils.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exchanges.status_utils import (
+    StatusClass,
+    classify_order_status,
+    is_order_canceled,
+    is_order_filled,
+    is_order_open,
+    is_order_partially_filled,
+    should_retry_post_only,
+)
+
+
+class TestStatusPredicates:
+    """Test the individual status predicates"""
+
+    def test_is_order_filled(self):
+        assert is_order_filled('FILLED') is True
+        assert is_order_filled('CLOSED') is True
+        assert is_order_filled('CLOSED', 'USER_CANCELED') is False
+        assert is_order_filled('OPEN') is False
+
+    def test_is_order_canceled(self):
+        for status in ('CANCELED', 'CANCELLED', 'REJECTED'):
+            assert is_order_canceled(status) is True
+        assert is_order_canceled('CLOSED', 'USER_CANCELED') is True
+        assert is_order_canceled('CLOSED') is False
+        assert is_order_canceled('FILLED') is False
+
+    def test_is_order_open(self):
+        for status in ('OPEN', 'NEW', 'PENDING'):
+            assert is_order_open(status) is True
+        assert is_order_open('FILLED') is False
+
+    def test_is_order_partially_filled(self):
+        assert is_order_partially_filled('PARTIALLY_FILLED') is True
+        assert is_order_partially_filled('OPEN', 0.5) is True
+        assert is_order_partially_filled('OPEN', 0) is False
+
+    def test_should_retry_post_only(self):
+        assert should_retry_post_only('CANCELED', 'POST_ONLY_WOULD_CROSS') is True
+        assert should_retry_post_only('REJECTED') is True
+        assert should_retry_post_only('CANCELED') is False
+
+
+class TestClassifyOrderStatus:
+    """Test the table-driven status classifier"""
+
+    def test_table_lookup(self):
+        assert classify_order_status('FILLED') is StatusClass.FILLED
+        assert classify_order_status('CANCELLED') is StatusClass.CANCELED
+        assert classify_order_status('REJECTED') is StatusClass.CANCELED
+        assert classify_order_status('NEW') is StatusClass.OPEN
+        assert classify_order_status('PARTIALLY_FILLED') is StatusClass.PARTIAL
+        assert classify_order_status('CANCELING') is StatusClass.OPEN
+        assert classify_order_status('SOMETHING_ELSE') is StatusClass.UNKNOWN
+        assert classify_order_status(None) is StatusClass.UNKNOWN
+
+    def test_closed_depends_on_cancel_reason(self):
+        assert classify_order_status('CLOSED') is StatusClass.FILLED
+        assert classify_order_status('CLOSED', 'USER_CANCELED') is StatusClass.CANCELED
+
+    def test_open_with_fill_is_partial(self):
+        assert classify_order_status('OPEN', filled_size=0.1) is StatusClass.PARTIAL
+        assert classify_order_status('OPEN', filled_size=0) is StatusClass.OPEN
@@ -0,0 +1,25 @@
+import pytest
+
+from helpers.telegram_bot import TelegramBot, close_telegram_bots, get_telegram_bot
+
+
+def test_get_telegram_bot_shares_instance_per_credentials():
+    first = get_telegram_bot("token-a", "chat-1")
+    assert isinstance(first, TelegramBot)
+    assert get_telegram_bot("token-a", "chat-1") is first
+    assert get_telegram_bot("token-a", "chat-2") is not first
+
+
+@pytest.mark.asyncio
+async def test_close_telegram_bots_evicts_shared_instances():
+    first = get_telegram_bot("token-b", "chat-1")
+    await close_telegram_bots()
+    assert first.async_session is None
+    assert get_telegram_bot("token-b", "chat-1") is not first
+
+
+@pytest.mark.asyncio
+async def test_aclose_allows_reuse():
+    bot = TelegramBot("token", "chat")
+    await bot.aclose()
+    assert bot.async_session is None
@@ -1,3 +1,4 @@
+import asyncio
 from decimal import Decimal
 
 import pytest
@@ -34,6 +35,17 @@ class DummyExchangeClient:
         return self.fetch_prices
 
 
+@pytest.fixture(autouse=True)
+def notification_env(monkeypatch):
+    monkeypatch.setenv("LARK_TOKEN", "test-token")
+
+
+@pytest.fixture(autouse=True)
+def log_dir(monkeypatch, tmp_path):
+    # Keep the dummy exchange's activity log and order CSV out of the repo's logs/
+    monkeypatch.setenv("LOG_DIR", str(tmp_path))
+
+
 @pytest.fixture
 def dummy_exchange(monkeypatch):
     exchange = DummyExchangeClient()
@@ -148,6 +160,28 @@ async def test_loss_alerts_trigger_for_buy_position(dummy_exchange, sample_confi
     assert messages[2].startswith("🚨 亏损告警")
 
 
+@pytest.mark.asyncio
+async def test_loss_check_treats_unknown_direction_as_sell(dummy_exchange, sample_config, monkeypatch, time_stub):
+    sample_config.direction = "short"
+    bot = TradingBot(sample_config)
+
+    messages = []
+
+    async def fake_send_notification(message):
+        messages.append(message)
+
+    monkeypatch.setattr(bot, "send_notification", fake_send_notification)
+
+    bot._record_open_fill(Decimal('1'), Decimal('100'))
+
+    dummy_exchange.fetch_prices = (Decimal('159'), Decimal('160'))
+    bot.last_loss_check_time = 0
+
+    await bot._check_position_loss()
+    assert len(messages) == 1
+    assert "60.0%" in messages[0]
+
+
 @pytest.mark.asyncio
 async def test_run_exception_triggers_notification(dummy_exchange, sample_config, monkeypatch):
     bot = TradingBot(sample_config)
@@ -204,3 +238,185 @@ async def test_runtime_report_every_30_minutes(dummy_exchange, sample_config, mo
     time_stub.advance(bot.report_interval + 1)
     await bot._maybe_send_runtime_report(Decimal("4"), Decimal("2"))
     assert len(messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_notification_is_queued_to_background_worker(dummy_exchange, sample_config, monkeypatch):
+    bot = TradingBot(sample_config)
+
+    delivered = []
+
+    async def fake_deliver(message):
+        delivered.append(message)
+
+    monkeypatch.setattr(bot, "_deliver_notification", fake_deliver)
+
+    bot._notify_task = asyncio.create_task(bot._notification_worker())
+    await bot.send_notification("hello")
+    assert delivered == []
+
+    await bot._stop_notification_worker()
+    assert delivered == ["hello"]
+    assert bot._notify_task is None
+
+
+@pytest.mark.asyncio
+async def test_notification_worker_coalesces_bursts(dummy_exchange, sample_config, monkeypatch):
+    bot = TradingBot(sample_config)
+
+    delivered = []
+
+    async def fake_deliver(message):
+        delivered.append(message)
+
+    monkeypatch.setattr(bot, "_deliver_notification", fake_deliver)
+
+    bot._notify_task = asyncio.create_task(bot._notification_worker())
+    for message in ("open", "status", "close"):
+        await bot.send_notification(message)
+
+    await bot._stop_notification_worker()
+    assert delivered == ["open\n\n───\n\nstatus\n\n───\n\nclose"]
+
+
+def test_coalesce_notifications_respects_limit():
+    batches = TradingBot._coalesce_notifications(["a" * 6, "b" * 6, "c" * 6], limit=20)
+    assert batches == ["a" * 6 + "\n\n───\n\n" + "b" * 6, "c" * 6]
+    assert TradingBot._coalesce_notifications(["a", "b"], limit=100) == ["a\n\n───\n\nb"]
+
+
+@pytest.mark.asyncio
+async def test_deliver_notification_reuses_long_lived_telegram_client(dummy_exchange, sample_config, monkeypatch):
+    monkeypatch.delenv("LARK_TOKEN", raising=False)
+    bot = TradingBot(sample_config)
+
+    class FakeTelegram:
+        def __init__(self):
+            self.sent = []
+
+        async def send_text_async(self, message):
+            self.sent.append(message)
+
+    bot._telegram_bot = FakeTelegram()
+    await bot._deliver_notification("one")
+    await bot._deliver_notification("two")
+    assert bot._telegram_bot.sent == ["one", "two"]
+
+
+def test_now_str_is_cached_per_second(monkeypatch):
+    import trading_bot
+
+    calls = []
+    real_strftime = trading_bot.time.strftime
+
+    def counting_strftime(fmt, t):
+        calls.append(t)
+        return real_strftime(fmt, t)
+
+    monkeypatch.setattr(trading_bot.time, "time", lambda: 1_700_000_000.2)
+    monkeypatch.setattr(trading_bot.time, "strftime", counting_strftime)
+    monkeypatch.setattr(trading_bot, "_ts_cache", [0, ""])
+
+    first = trading_bot._now_str()
+    assert trading_bot._now_str() == first
+    assert len(calls) == 1
+
+    monkeypatch.setattr(trading_bot.time, "time", lambda: 1_700_000_001.0)
+    trading_bot._now_str()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_bbo_prices_reused_within_ttl(dummy_exchange, sample_config, time_stub):
+    bot = TradingBot(sample_config)
+
+    calls = []
+    original_fetch = dummy_exchange.fetch_bbo_prices
+
+    async def counting_fetch(contract_id):
+        calls.append(contract_id)
+        return await original_fetch(contract_id)
+
+    dummy_exchange.fetch_bbo_prices = counting_fetch
+
+    assert await bot._cached_bbo_prices() == (Decimal('100'), Decimal('101'))
+    assert await bot._cached_bbo_prices() == (Decimal('100'), Decimal('101'))
+    assert len(calls) == 1
+
+    time_stub.advance(1)
+    dummy_exchange.fetch_prices = (Decimal('102'), Decimal('103'))
+    assert await bot._cached_bbo_prices() == (Decimal('102'), Decimal('103'))
+    assert len(calls) == 2
+
+
+def test_record_fills_coerce_floats_to_decimal(dummy_exchange, sample_config):
+    bot = TradingBot(sample_config)
+
+    bot._record_open_fill(1.5, 100.1)
+    assert bot.open_positions[0]["size"] == Decimal('1.5')
+    assert bot.cumulative_quote_volume == Decimal('150.15')
+
+    bot._record_close_fill(0.5, 101.0)
+    assert bot.open_positions[0]["size"] == Decimal('1.0')
+
+
+@pytest.mark.asyncio
+async def test_loss_alerts_trigger_for_sell_position(dummy_exchange, sample_config, monkeypatch, time_stub):
+    sample_config.direction = "sell"
+    bot = TradingBot(sample_config)
+
+    messages = []
+
+    async def fake_send_notification(message):
+        messages.append(message)
+
+    monkeypatch.setattr(bot, "send_notification", fake_send_notification)
+
+    bot._record_open_fill(Decimal('1'), Decimal('100'))
+    dummy_exchange.fetch_prices = (Decimal('159'), Decimal('160'))
+
+    await bot._check_position_loss()
+    assert len(messages) == 1
+    assert "60.0%" in messages[0]
+
+
+@pytest.mark.asyncio
+async def test_alert_checks_skip_order_book_when_notifications_disabled(dummy_exchange, sample_config, monkeypatch):
+    monkeypatch.delenv("LARK_TOKEN", raising=False)
+    monkeypatch.delenv("TELEGRAM_BOT_TOKEN", raising=False)
+    bot = TradingBot(sample_config)
+    assert bot.notifications_enabled is False
+
+    async def failing_fetch(contract_id):
+        raise AssertionError("order book should not be fetched")
+
+    dummy_exchange.fetch_bbo_prices = failing_fetch
+    bot._record_open_fill(Decimal('1'), Decimal('100'))
+
+    await bot._check_position_loss()
+    await bot._maybe_send_runtime_report(Decimal('1'), Decimal('1'))
+
+
+@pytest.mark.asyncio
+async def test_graceful_shutdown_wakes_idle_wait(dummy_exchange, sample_config):
+    bot = TradingBot(sample_config)
+
+    sleeper = asyncio.create_task(bot._sleep_until_shutdown(30))
+    await asyncio.sleep(0)
+    await bot.graceful_shutdown("test")
+
+    await asyncio.wait_for(sleeper, 1)
+    assert bot.shutdown_requested is True
+
+
+@pytest.mark.asyncio
+async def test_send_notification_drops_oldest_when_queue_full(dummy_exchange, sample_config):
+    bot = TradingBot(sample_config)
+    bot._notify_queue = asyncio.Queue(maxsize=2)
+    bot._notify_task = object()
+
+    for message in ("a", "b", "c"):
+        await bot.send_notification(message)
+
+    assert bot._dropped_notifications == 1
+    assert [bot._notify_queue.get_nowait() for _ in range(2)] == ["b", "c"]
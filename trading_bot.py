@@ -14,7 +14,65 @@ from exchanges import ExchangeFactory
 from exchanges.base import OrderResult
 from helpers import TradingLogger, TradingStats
 from helpers.lark_bot import LarkBot
-from helpers.telegram_bot import TelegramBot
+from helpers.telegram_bot import TelegramBot, get_telegram_bot
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+NOTIFICATION_SEPARATOR = "\n\n───\n\n"
+NOTIFICATION_COALESCE_WINDOW = 0.3
+NOTIFICATION_QUEUE_SIZE = 256
+
+# Notification templates keyed by kind, rendered by TradingBot._build_message
+_TEMPLATES = {
+    'market_close_failed': (
+        "⚠️ [{label}] 兜底平仓订单失败，请手动处理！\n\n"
+        "IOC 成交: {ioc_filled}/{quantity}\n"
+        "剩余数量: {remaining}\n"
+        "失败原因: {error}\n\n"
+        "当前可能有未平仓位，请检查并手动平仓！"
+    ),
+    'position_mismatch': (
+        "\n\nERROR: [{label}] Position mismatch detected\n"
+        "###### ERROR ###### ERROR ###### ERROR ###### ERROR #####\n"
+        "Please manually rebalance your position and take-profit orders\n"
+        "请手动平衡当前仓位和正在关闭的仓位\n"
+        "current position: {position_amt} | active closing amount: {active_close_amount} | Order quantity: {order_count}\n"
+        "###### ERROR ###### ERROR ###### ERROR ###### ERROR #####\n"
+    ),
+    'utilization': (
+        "🚨 风险提醒 | {label} 当前已有 {active_close_count}/{max_orders} (≈{current_pct:.1f}%) 平仓单，"
+        "达到 {threshold_pct}% 阈值，请注意潜在下跌风险。"
+    ),
+    'loss': (
+        "🚨 亏损告警 | {label} 仓位亏损约 "
+        "{loss_percent:.1f}% (入场价 {entry_price:.4f}, 当前价 {current_price:.4f}, 数量 {size:.4f})。"
+    ),
+    'stop_price': (
+        "\n\nWARNING: [{label}] \n"
+        "Stopped trading due to stop price triggered\n"
+        "价格已经达到停止交易价格，脚本将停止交易\n"
+    ),
+    'crash': "🚨 程序异常 | {label} 出现未捕获错误: {error}，程序将退出。",
+}
+
+# direction -> (index into (best_bid, best_ask) that marks the position, sign of entry - mark for a loss);
+# any direction other than 'buy' is marked like 'sell'
+_MARK_SIDE = {'buy': (0, 1), 'sell': (1, -1)}
+
+_ts_cache = [0, ""]
+
+
+def _D(value) -> Decimal:
+    """Coerce exchange-supplied numbers to Decimal once, so PnL arithmetic never mixes in floats."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _now_str() -> str:
+    """Local '%Y-%m-%d %H:%M:%S' timestamp, formatted at most once per wall-clock second."""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+    return _ts_cache[1]
 
 
 @dataclass
@@ -47,14 +105,14 @@ class OrderMonitor:
     order_id: Optional[str] = None
     filled: bool = False
     filled_price: Optional[Decimal] = None
-    filled_qty: Decimal = 0.0
+    filled_qty: Decimal = Decimal('0')
 
     def reset(self):
         """Reset the monitor state."""
         self.order_id = None
         self.filled = False
         self.filled_price = None
-        self.filled_qty = 0.0
+        self.filled_qty = Decimal('0')
 
 
 class TradingBot:
@@ -63,6 +121,8 @@ class TradingBot:
     def __init__(self, config: TradingConfig):
         self.config = config
         self.logger = TradingLogger(config.exchange, config.ticker, log_to_console=True)
+        # Shared "EXCHANGE_TICKER" label used in every notification header
+        self._label = f"{config.exchange.upper()}_{config.ticker.upper()}"
 
         # Create exchange client
         try:
@@ -81,7 +141,13 @@ class TradingBot:
         self.current_order_status = None
         self.order_filled_event = asyncio.Event()
         self.order_canceled_event = asyncio.Event()
+
+        # Short-lived BBO snapshot shared by the monitoring checks within one loop iteration
+        self._bbo_cache = None
+        self._bbo_cache_ttl = 0.25
         self.shutdown_requested = False
+        # Set alongside shutdown_requested so idle waits in the main loop end immediately
+        self.shutdown_event = asyncio.Event()
         self.loop = None
 
         self.order_utilization_alerts = {
@@ -103,6 +169,18 @@ class TradingBot:
         # Enhanced statistics tracking
         self.stats = TradingStats()
 
+        # Notification delivery runs on a background task so Telegram/Lark I/O never blocks trading
+        self._notify_queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        self._notify_task = None
+        self._dropped_notifications = 0
+        self._reported_dropped = 0
+        self._telegram_bot = None
+        # Read notification credentials once; runbot loads the .env file before constructing the bot
+        self._lark_token = os.getenv("LARK_TOKEN")
+        self._telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
+        self._telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
+        self.notifications_enabled = bool(self._lark_token or (self._telegram_token and self._telegram_chat_id))
+
         # Register order callback
         self._setup_websocket_handlers()
 
@@ -110,6 +188,7 @@ class TradingBot:
         """Perform graceful shutdown of the trading bot."""
         self.logger.log(f"Starting graceful shutdown: {reason}", "INFO")
         self.shutdown_requested = True
+        self.shutdown_event.set()
 
         try:
             # Disconnect from exchange
@@ -132,9 +211,9 @@ class TradingBot:
                 status = message.get('status')
                 side = message.get('side', '')
                 order_type = message.get('order_type', '')
-                filled_size = Decimal(message.get('filled_size'))
+                filled_size = _D(message.get('filled_size'))
                 try:
-                    price = Decimal(str(message.get('price', '0')))
+                    price = _D(message.get('price', '0'))
                 except Exception:
                     price = Decimal('0')
                 if order_type == "OPEN":
@@ -190,6 +269,13 @@ class TradingBot:
         # Setup order update handler
         self.exchange_client.setup_order_update_handler(order_update_handler)
 
+    async def _sleep_until_shutdown(self, seconds: float):
+        """Sleep up to seconds, returning early once a graceful shutdown is requested."""
+        try:
+            await asyncio.wait_for(self.shutdown_event.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
     def _calculate_wait_time(self) -> Decimal:
         """Calculate wait time between orders."""
         cool_down_time = self.config.wait_time
@@ -226,7 +312,7 @@ class TradingBot:
             # Reset state before placing order
             self.order_filled_event.clear()
             self.current_order_status = 'OPEN'
-            self.order_filled_amount = 0.0
+            self.order_filled_amount = Decimal('0')
 
             # Place the order
             # 等待 WebSocket 事件同步，避免上一订单状态未更新导致重复下单
@@ -257,6 +343,16 @@ class TradingBot:
             self.logger.log(f"Traceback: {traceback.format_exc()}", "ERROR")
             return False
 
+    async def _cached_bbo_prices(self):
+        """Return (best_bid, best_ask), reusing a snapshot younger than the cache TTL."""
+        now = time.time()
+        cached = self._bbo_cache
+        if cached is not None and now - cached[0] < self._bbo_cache_ttl:
+            return cached[1], cached[2]
+        best_bid, best_ask = await self.exchange_client.fetch_bbo_prices(self.config.contract_id)
+        self._bbo_cache = (now, best_bid, best_ask)
+        return best_bid, best_ask
+
     async def _get_mid_price(self) -> Decimal:
         """Get the current mid price from the order book."""
         try:
@@ -395,13 +491,12 @@ class TradingBot:
                     # 兜底的 MARKET 订单失败，统一触发 TG 告警
                     ioc_filled = ioc_result.filled_size if (ioc_result and ioc_result.success) else 0
                     remaining = quantity - ioc_filled
-                    alert_msg = (
-                        f"⚠️ [{self.config.exchange.upper()}_{self.config.contract}] "
-                        f"兜底平仓订单失败，请手动处理！\n\n"
-                        f"IOC 成交: {ioc_filled}/{quantity}\n"
-                        f"剩余数量: {remaining}\n"
-                        f"失败原因: {market_result.error_message}\n\n"
-                        f"当前可能有未平仓位，请检查并手动平仓！"
+                    alert_msg = self._build_message(
+                        'market_close_failed',
+                        ioc_filled=ioc_filled,
+                        quantity=quantity,
+                        remaining=remaining,
+                        error=market_result.error_message,
                     )
                     try:
                         await self.send_notification(alert_msg)
@@ -696,13 +791,12 @@ class TradingBot:
                 await self._maybe_send_runtime_report(position_amt, active_close_amount)
                 # Check for position mismatch
                 if abs(position_amt - active_close_amount) > (2 * self.config.quantity):
-                    error_message = f"\n\nERROR: [{self.config.exchange.upper()}_{self.config.ticker.upper()}] "
-                    error_message += "Position mismatch detected\n"
-                    error_message += "###### ERROR ###### ERROR ###### ERROR ###### ERROR #####\n"
-                    error_message += "Please manually rebalance your position and take-profit orders\n"
-                    error_message += "请手动平衡当前仓位和正在关闭的仓位\n"
-                    error_message += f"current position: {position_amt} | active closing amount: {active_close_amount} | "f"Order quantity: {len(self.active_close_orders)}\n"
-                    error_message += "###### ERROR ###### ERROR ###### ERROR ###### ERROR #####\n"
+                    error_message = self._build_message(
+                        'position_mismatch',
+                        position_amt=position_amt,
+                        active_close_amount=active_close_amount,
+                        order_count=len(self.active_close_orders),
+                    )
                     self.logger.log(error_message, "ERROR")
 
                     await self.send_notification(error_message.lstrip())
@@ -730,15 +824,18 @@ class TradingBot:
         for threshold, sent in self.order_utilization_alerts.items():
             if not sent and utilization >= threshold:
                 current_pct = round(utilization * 100, 1)
-                message = (
-                    f"🚨 风险提醒 | {self.config.exchange.upper()}_{self.config.ticker.upper()} 当前已有 "
-                    f"{active_close_count}/{self.config.max_orders} (≈{current_pct:.1f}%) 平仓单，"
-                    f"达到 {int(threshold * 100)}% 阈值，请注意潜在下跌风险。"
+                message = self._build_message(
+                    'utilization',
+                    active_close_count=active_close_count,
+                    max_orders=self.config.max_orders,
+                    current_pct=current_pct,
+                    threshold_pct=int(threshold * 100),
                 )
                 await self.send_notification(message)
                 self.order_utilization_alerts[threshold] = True
 
     def _record_open_fill(self, size: Decimal, price: Decimal):
+        size, price = _D(size), _D(price)
         if size <= 0:
             return
 
@@ -760,6 +857,7 @@ class TradingBot:
         })
 
     def _record_close_fill(self, size: Decimal, price: Decimal):
+        size, price = _D(size), _D(price)
         if size <= 0:
             return
 
@@ -784,7 +882,8 @@ class TradingBot:
                 remaining = Decimal('0')
 
     async def _check_position_loss(self):
-        if not self.open_positions:
+        # Loss checks only exist to alert; skip the order book round-trip when nobody would be notified
+        if not self.notifications_enabled or not self.open_positions:
             return
 
         now = time.time()
@@ -792,12 +891,13 @@ class TradingBot:
             return
 
         try:
-            best_bid, best_ask = await self.exchange_client.fetch_bbo_prices(self.config.contract_id)
+            best_bid, best_ask = await self._cached_bbo_prices()
         except Exception as e:
             self.logger.log(f"Failed to fetch order book for loss check: {e}", "WARNING")
             return
 
-        current_price = best_bid if self.config.direction == "buy" else best_ask
+        mark_index, loss_sign = _MARK_SIDE.get(self.config.direction, _MARK_SIDE['sell'])
+        current_price = _D((best_bid, best_ask)[mark_index])
         if current_price <= 0:
             current_price = Decimal('0')
 
@@ -805,27 +905,31 @@ class TradingBot:
 
         for position in self.open_positions:
             entry_price = position["price"]
-            if entry_price <= 0:
+            # Nothing left to alert on for this position; skip the Decimal arithmetic entirely
+            if entry_price <= 0 or all(position["alerts"].values()):
                 continue
 
-            if self.config.direction == "buy":
-                loss_pct = max(Decimal('0'), (entry_price - current_price) / entry_price)
-            else:
-                loss_pct = max(Decimal('0'), (current_price - entry_price) / entry_price)
+            loss_pct = max(Decimal('0'), loss_sign * (entry_price - current_price) / entry_price)
 
             for threshold in self.loss_alert_thresholds:
                 if position["alerts"].get(threshold):
                     continue
                 if loss_pct >= threshold:
                     loss_percent = loss_pct * Decimal('100')
-                    message = (
-                        f"🚨 亏损告警 | {self.config.exchange.upper()}_{self.config.ticker.upper()} 仓位亏损约 "
-                        f"{loss_percent:.1f}% (入场价 {entry_price:.4f}, 当前价 {current_price:.4f}, 数量 {position['size']:.4f})。"
+                    message = self._build_message(
+                        'loss',
+                        loss_percent=loss_percent,
+                        entry_price=entry_price,
+                        current_price=current_price,
+                        size=position['size'],
                     )
                     await self.send_notification(message)
                     position["alerts"][threshold] = True
 
     async def _maybe_send_runtime_report(self, position_amt: Decimal, active_close_amount: Decimal):
+        if not self.notifications_enabled:
+            return
+
         now_ts = time.time()
         if self.last_report_time != 0 and now_ts - self.last_report_time < self.report_interval:
             return
@@ -844,7 +948,7 @@ class TradingBot:
         active_close_count = len(self.active_close_orders)
         remaining_capacity = max(self.config.max_orders - active_close_count, 0)
         lines = [
-            f"[运行统计] {self.config.exchange.upper()}_{self.config.ticker.upper()}",
+            f"[运行统计] {self._label}",
             f"- 当前持仓: {self._fmt_decimal(position_amt)}",
             f"- 活跃平仓订单数量: {active_close_count}",
             f"- 活跃平仓订单总量: {self._fmt_decimal(active_close_amount)}",
@@ -860,20 +964,20 @@ class TradingBot:
         
         # Get market prices (protected)
         try:
-            best_bid, best_ask = await self.exchange_client.fetch_bbo_prices(self.config.contract_id)
+            best_bid, best_ask = await self._cached_bbo_prices()
             mid_price = (best_bid + best_ask) / 2
             spread = best_ask - best_bid
             spread_pct = (spread / mid_price * 100) if mid_price > 0 else Decimal('0')
-            self.stats.record_price_sample(best_bid, best_ask)
+            self.stats.record_price_sample(best_bid, best_ask, mid_price, spread)
         except:
             best_bid = best_ask = mid_price = spread = spread_pct = Decimal('0')
 
         # Build report
         mode_label = "Boost刷量" if self.config.boost_mode else "网格交易"
         report_lines = [
-            f"📈 [{mode_label}报告] {self.config.exchange.upper()}_{self.config.ticker.upper()}",
+            f"📈 [{mode_label}报告] {self._label}",
             "━━━━━━━━━━━━━━━━━━━━━━",
-            f"⏰ 报告时间: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"⏰ 报告时间: {_now_str()}",
             f"🕐 运行时长: {self.stats.get_runtime_formatted()}",
             "",
             "【交易成果】💎",
@@ -987,7 +1091,7 @@ class TradingBot:
         if self.config.pause_price == self.config.stop_price == -1:
             return stop_trading, pause_trading
 
-        best_bid, best_ask = await self.exchange_client.fetch_bbo_prices(self.config.contract_id)
+        best_bid, best_ask = await self._cached_bbo_prices()
         if best_bid <= 0 or best_ask <= 0 or best_bid >= best_ask:
             raise ValueError("No bid/ask data available")
 
@@ -1016,17 +1120,93 @@ class TradingBot:
         except Exception:
             return str(value)
 
+    def _build_message(self, kind: str, **fields) -> str:
+        """Render a notification template; every template gets the EXCHANGE_TICKER label."""
+        fields['label'] = self._label
+        return _TEMPLATES[kind].format_map(fields)
+
     async def send_notification(self, message: str):
-        lark_token = os.getenv("LARK_TOKEN")
-        if lark_token:
-            async with LarkBot(lark_token) as lark_bot:
+        """Queue a notification; delivered inline when the background worker is not running."""
+        if self._notify_task is None:
+            await self._deliver_notification(message)
+            return
+        try:
+            self._notify_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Bounded memory during outages: drop the oldest message so the latest state still goes out
+            self._notify_queue.get_nowait()
+            self._notify_queue.task_done()
+            self._notify_queue.put_nowait(message)
+            self._dropped_notifications += 1
+
+    async def _deliver_notification(self, message: str):
+        if self._lark_token:
+            async with LarkBot(self._lark_token) as lark_bot:
                 await lark_bot.send_text(message)
 
-        telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
-        telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
-        if telegram_token and telegram_chat_id:
-            with TelegramBot(telegram_token, telegram_chat_id) as tg_bot:
-                tg_bot.send_text(message)
+        if self._telegram_bot is not None:
+            await self._telegram_bot.send_text_async(message)
+            return
+
+        if self._telegram_token and self._telegram_chat_id:
+            async with TelegramBot(self._telegram_token, self._telegram_chat_id) as tg_bot:
+                await tg_bot.send_text_async(message)
+
+    @staticmethod
+    def _coalesce_notifications(messages, limit: int = TELEGRAM_MESSAGE_LIMIT):
+        """Join messages into as few payloads as possible without exceeding the Telegram size limit."""
+        batches = []
+        current = ""
+        for message in messages:
+            if current and len(current) + len(NOTIFICATION_SEPARATOR) + len(message) > limit:
+                batches.append(current)
+                current = ""
+            current = f"{current}{NOTIFICATION_SEPARATOR}{message}" if current else message
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _notification_worker(self):
+        """Drain the notification queue, coalescing bursts into a single send."""
+        while True:
+            messages = [await self._notify_queue.get()]
+            # Give a burst of events a short window to arrive before sending
+            await asyncio.sleep(NOTIFICATION_COALESCE_WINDOW)
+            while True:
+                try:
+                    messages.append(self._notify_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                for payload in self._coalesce_notifications(messages):
+                    await self._deliver_notification(payload)
+            except Exception as e:
+                self.logger.log(f"Failed to send notification: {e}", "ERROR")
+            finally:
+                for _ in messages:
+                    self._notify_queue.task_done()
+            if self._dropped_notifications != self._reported_dropped:
+                self._reported_dropped = self._dropped_notifications
+                self.logger.log(f"Notification queue overflowed, {self._dropped_notifications} messages dropped so far",
+                                "WARNING")
+
+    async def _stop_notification_worker(self, timeout: float = 10):
+        """Flush pending notifications, then stop the worker."""
+        task, self._notify_task = self._notify_task, None
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(self._notify_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.log("Timed out flushing pending notifications", "WARNING")
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # The client is shared per (token, chat_id) with other bots in the process, so it is
+        # only released here; close_telegram_bots() closes its sessions at process shutdown
+        self._telegram_bot = None
 
     async def run(self):
         """Main trading loop."""
@@ -1051,6 +1231,10 @@ class TradingBot:
 
             # Capture the running event loop for thread-safe callbacks
             self.loop = asyncio.get_running_loop()
+            if self._telegram_token and self._telegram_chat_id:
+                # Long-lived client so consecutive sends reuse the same TLS connection
+                self._telegram_bot = get_telegram_bot(self._telegram_token, self._telegram_chat_id)
+            self._notify_task = asyncio.create_task(self._notification_worker())
 
             # Pass stats to exchange client for real-time fee tracking from WebSocket
             if hasattr(self.exchange_client, 'set_stats'):
@@ -1083,27 +1267,25 @@ class TradingBot:
 
                 stop_trading, pause_trading = await self._check_price_condition()
                 if stop_trading:
-                    msg = f"\n\nWARNING: [{self.config.exchange.upper()}_{self.config.ticker.upper()}] \n"
-                    msg += "Stopped trading due to stop price triggered\n"
-                    msg += "价格已经达到停止交易价格，脚本将停止交易\n"
+                    msg = self._build_message('stop_price')
                     await self.send_notification(msg.lstrip())
                     await self.graceful_shutdown(msg)
                     continue
 
                 if pause_trading:
-                    await asyncio.sleep(5)
+                    await self._sleep_until_shutdown(5)
                     continue
 
                 if not mismatch_detected:
                     wait_time = self._calculate_wait_time()
 
                     if wait_time > 0:
-                        await asyncio.sleep(wait_time)
+                        await self._sleep_until_shutdown(wait_time)
                         continue
                     else:
                         meet_grid_step_condition = await self._meet_grid_step_condition()
                         if not meet_grid_step_condition:
-                            await asyncio.sleep(1)
+                            await self._sleep_until_shutdown(1)
                             continue
 
                         await self._place_and_monitor_open_order()
@@ -1115,10 +1297,7 @@ class TradingBot:
         except Exception as e:
             self.logger.log(f"Critical error: {e}", "ERROR")
             self.logger.log(f"Traceback: {traceback.format_exc()}", "ERROR")
-            error_message = (
-                f"🚨 程序异常 | {self.config.exchange.upper()}_{self.config.ticker.upper()} "
-                f"出现未捕获错误: {e}，程序将退出。"
-            )
+            error_message = self._build_message('crash', error=e)
             try:
                 await self.send_notification(error_message)
             except Exception as notify_err:
@@ -1131,3 +1310,4 @@ class TradingBot:
                 await self.exchange_client.disconnect()
             except Exception as e:
                 self.logger.log(f"Error disconnecting from exchange: {e}", "ERROR")
+            await self._stop_notification_worker()